@@ -7,6 +7,7 @@ Handles login, code entry, and complete survey automation for multiple access co
 import sys
 import os
 import json
+import stat
 import time
 import random
 import tempfile
@@ -14,6 +15,11 @@ from datetime import datetime
 from typing import Dict, List, Optional
 from pathlib import Path
 
+try:
+    import orjson  # Optional: faster JSON load
+except ImportError:
+    orjson = None
+
 # --- OPRAVA: TOTO MUSÍ BÝT NA SAMOTNÉM ZAČÁTKU ---
 # Tento blok přidá adresář 'src' do cesty, kde Python hledá moduly.
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
@@ -22,14 +28,12 @@ sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src
 from loguru import logger
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 
 from config import Config
-from smart_playback_system import SmartPlaybackSystem
 from utils.status_indicator_manager import StatusIndicatorManager
 
 class BatchSurveyProcessor:
@@ -44,8 +48,49 @@ class BatchSurveyProcessor:
     - Configurable user profiles and delays
     """
 
-    def __init__(self, config_file: str = "config/batch_config.json"):
+    # Thank-you page phrases, matched in the page so the full page source is not transferred
+    COMPLETION_PHRASES = ['děkujeme', 'vaše odpovědi byly v pořádku uloženy', 'dokončeno', 'thank']
+    # All completion checks in one call: official completion divs, then URL, then thank-you phrases.
+    # Returns {official, text} when completed, null otherwise
+    COMPLETION_CHECK_JS = """
+    var wrapper = document.querySelector('div.completed-wrapper');
+    var textDiv = document.querySelector('div.completed-text');
+    if (wrapper && textDiv) {
+        return {official: true, text: textDiv.innerText};
+    }
+    if (location.href.toLowerCase().indexOf('completed') !== -1) {
+        return {official: false, text: null};
+    }
+    var html = document.documentElement.outerHTML.toLowerCase();
+    var found = arguments[0].some(function(phrase) { return html.indexOf(phrase) !== -1; });
+    return found ? {official: false, text: null} : null;
+    """
+
+    # Survey ID in the URL once the access code is accepted
+    SURVEY_URL_MARKER = "592479"
+    # Alert LimeSurvey shows for an invalid or already used access code
+    ERROR_ALERT_LOCATOR = (By.CSS_SELECTOR, "ul.alert-danger")
+
+    # Fills the access code and clicks submit in one call: arguments = (input element, submit selector, code)
+    FILL_AND_SUBMIT_JS = """
+    var input = arguments[0];
+    input.value = arguments[2];
+    input.dispatchEvent(new Event('input', {bubbles: true}));
+    input.dispatchEvent(new Event('change', {bubbles: true}));
+    var submit = document.querySelector(arguments[1]);
+    if (!submit) {
+        return false;
+    }
+    submit.click();
+    return true;
+    """
+
+    def __init__(self, config_file: str = "config/batch_config.json", attach: bool = False):
         self.config_file = config_file
+        # Reuse the persistent debug-port browser instead of starting Chrome per survey
+        self.attach = attach
+        # Attach mode keeps one BrowserManager and its WebDriver session for the whole batch
+        self._browser_manager = None
         self.config = {}
         self.load_config()
 
@@ -68,8 +113,12 @@ class BatchSurveyProcessor:
     def load_config(self):
         """Load batch configuration"""
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                self.config = json.load(f)
+            if orjson is not None:
+                with open(self.config_file, 'rb') as f:
+                    self.config = orjson.loads(f.read())
+            else:
+                with open(self.config_file, 'r', encoding='utf-8') as f:
+                    self.config = json.load(f)
             logger.info(f"Configuration loaded from {self.config_file}")
         except Exception as e:
             logger.error(f"Failed to load config: {e}")
@@ -82,9 +131,10 @@ class BatchSurveyProcessor:
         # Create logs directory
         os.makedirs('logs', exist_ok=True)
 
-        # Add batch-specific log file
+        # Add batch-specific log file - written from loguru's background thread (enqueue),
+        # so the thread driving the browser doesn't wait on file I/O; loguru drains the queue at exit
         batch_log_file = f"logs/batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-        logger.add(batch_log_file, level=log_level, format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}")
+        logger.add(batch_log_file, level=log_level, format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}", enqueue=True)
 
         logger.info(f"Batch logging setup complete - Level: {log_level}")
 
@@ -97,6 +147,10 @@ class BatchSurveyProcessor:
         temp_base = Path(tempfile.gettempdir()) / f"chrome_batch_{random_suffix}"
         chrome_options.add_argument(f"--user-data-dir={temp_base}")
 
+        # Static assets are cached across surveys - cookies stay in the clean profile above
+        cache_dir = Path(tempfile.gettempdir()) / "chrome_batch_cache"
+        chrome_options.add_argument(f"--disk-cache-dir={cache_dir}")
+
         # Window size and position from config
         chrome_options.add_argument(f"--window-size={Config.BROWSER_WINDOW_SIZE}")
         chrome_options.add_argument(f"--window-position={Config.BROWSER_WINDOW_POSITION}")
@@ -108,8 +162,22 @@ class BatchSurveyProcessor:
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
 
+        # driver.get() returns at DOMContentLoaded - every later step has its own explicit wait
+        chrome_options.page_load_strategy = 'eager'
+
+        if Config.BROWSER_HEADLESS:
+            chrome_options.add_argument("--headless=new")
+            chrome_options.add_argument("--disable-gpu")
+            chrome_options.add_argument("--disable-extensions")
+
+        if Config.BROWSER_DISABLE_IMAGES:
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+
         # Use webdriver-manager for automatic chromedriver management with cross-platform path fix
         try:
+            # Imported here - only needed when a browser is actually started
+            from webdriver_manager.chrome import ChromeDriverManager
+
             # Get raw path from webdriver-manager
             raw_path = ChromeDriverManager().install()
             logger.debug(f"webdriver-manager returned path: {raw_path}")
@@ -133,7 +201,6 @@ class BatchSurveyProcessor:
                 logger.debug(f"Linux: Checking for executable at: {expected_exe_path}")
                 if expected_exe_path.is_file():
                     # Ensure executable permissions on Linux
-                    import stat
                     expected_exe_path.chmod(expected_exe_path.stat().st_mode | stat.S_IEXEC)
                     chromedriver_path = str(expected_exe_path)
                     logger.info(f"Using corrected Linux path: {chromedriver_path}")
@@ -144,7 +211,6 @@ class BatchSurveyProcessor:
                             potential_exe = subdir / "chromedriver"
                             if potential_exe.is_file():
                                 # Ensure executable permissions on Linux
-                                import stat
                                 potential_exe.chmod(potential_exe.stat().st_mode | stat.S_IEXEC)
                                 chromedriver_path = str(potential_exe)
                                 logger.info(f"Found chromedriver in subdirectory: {chromedriver_path}")
@@ -165,6 +231,36 @@ class BatchSurveyProcessor:
         logger.debug(f"Clean browser created with temp dir: {temp_base}")
         return driver
 
+    def attach_to_browser(self) -> webdriver.Chrome:
+        """Attach to the persistent Chrome on the debug port and clear its cookies for a fresh survey session"""
+        if self._browser_manager is None:
+            # Imported here - only needed in attach mode
+            from browser_manager import BrowserManager
+            self._browser_manager = BrowserManager()
+
+        # Reuse the session from the previous survey while it is alive - no new probes or chromedriver
+        driver = self._browser_manager.driver
+        if driver is not None:
+            try:
+                driver.current_url
+            except WebDriverException:
+                logger.debug("Previous browser session is gone - reconnecting")
+                driver = None
+
+        if driver is None:
+            driver = self._browser_manager.get_or_create_browser(keep_alive=True)
+            if not driver:
+                raise Exception(f"Could not attach to browser on port {Config.CHROME_DEBUG_PORT}")
+
+        try:
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        except WebDriverException as e:
+            logger.debug(f"CDP cookie clear failed, clearing current domain only: {e}")
+            driver.delete_all_cookies()
+
+        logger.debug(f"Attached to persistent browser on port {Config.CHROME_DEBUG_PORT}")
+        return driver
+
     def handle_survey_login(self, driver: webdriver.Chrome, access_code: str, status_manager: StatusIndicatorManager, survey_number: int, total_surveys: int) -> bool:
         """
         Handle complete survey login process
@@ -183,7 +279,6 @@ class BatchSurveyProcessor:
             logger.info(f"Navigating to {base_url}")
             driver.get(base_url)
             status_manager.set_status_with_progress('running', survey_number, total_surveys, f'Připojuji se k systému - dotazník {access_code}')
-            time.sleep(3)
 
             # Step 2: Click survey link
             logger.info("Looking for survey link...")
@@ -193,29 +288,33 @@ class BatchSurveyProcessor:
             logger.info(f"Found survey link: {survey_link.text[:50]}...")
             status_manager.set_status_with_progress('processing', survey_number, total_surveys, f'Otevírám dotazník - {access_code}')
             survey_link.click()
-            time.sleep(3)
 
             # Step 3: Enter access code
             logger.info(f"Entering access code: {access_code}")
             status_manager.set_status_with_progress('processing', survey_number, total_surveys, f'Přihlašuji se pomocí kódu - {access_code}')
             code_input = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, code_input_selector)))
-            code_input.clear()
-            code_input.send_keys(access_code)
-            time.sleep(1)
 
-            # Step 4: Submit access code to enter survey
+            # Step 4: Fill and submit access code in one call
             logger.info("Submitting access code...")
-            submit_button = driver.find_element(By.CSS_SELECTOR, access_code_submit_selector)
-            submit_button.click()
-            time.sleep(3)
+            if not driver.execute_script(self.FILL_AND_SUBMIT_JS, code_input, access_code_submit_selector, access_code):
+                raise Exception(f"Submit button not found: {access_code_submit_selector}")
+
+            # Wait until the survey opens or the invalid-code alert shows up
+            try:
+                wait.until(EC.any_of(
+                    EC.url_contains(self.SURVEY_URL_MARKER),
+                    EC.presence_of_element_located(self.ERROR_ALERT_LOCATOR)
+                ))
+            except TimeoutException:
+                logger.warning("Survey page did not load after submitting access code")
 
             # Verify we're in the survey
             current_url = driver.current_url
 
-            # Check for invalid code error alert
+            # Check for invalid code error alert - no probe when the survey already opened
             try:
-                error_alert = driver.find_element(By.CSS_SELECTOR, "ul.alert-danger")
-                error_text = error_alert.text
+                error_alerts = [] if self.SURVEY_URL_MARKER in current_url else driver.find_elements(*self.ERROR_ALERT_LOCATOR)
+                error_text = error_alerts[0].text if error_alerts else ""
                 if "není platný" in error_text or "již byl použit" in error_text:
                     logger.error(f"Invalid access code: {access_code}")
                     logger.warning(f"⚠️ Chybová hláška: {error_text}")
@@ -223,16 +322,25 @@ class BatchSurveyProcessor:
                     print(f"❌ NEPLATNÝ HASH KÓD: {access_code}")
                     print(f"{'='*70}")
                     print(f"Chyba: {error_text}")
+
+                    # Unattended runs (no terminal or BATCH_INTERACTIVE=false) skip the code instead of blocking
+                    if not (Config.BATCH_INTERACTIVE and sys.stdin.isatty()):
+                        logger.warning("Non-interactive run - skipping invalid code")
+                        return False
+
                     print("\nProsím zadejte platný hash kód do prohlížeče a stiskněte Enter.")
                     print("Nebo stiskněte Ctrl+C pro přerušení.\n")
                     input("Stiskněte Enter po zadání platného kódu: ")
-                    time.sleep(2)
+                    try:
+                        WebDriverWait(driver, 10).until(EC.url_contains(self.SURVEY_URL_MARKER))
+                    except TimeoutException:
+                        logger.warning("Survey page did not load after entering a new code")
                     current_url = driver.current_url
             except:
                 # No error alert found - continue normally
                 pass
 
-            if "592479" in current_url:
+            if self.SURVEY_URL_MARKER in current_url:
                 logger.success(f"Successfully logged in to survey with code: {access_code}")
                 return True
             else:
@@ -263,12 +371,14 @@ class BatchSurveyProcessor:
         }
 
         driver = None
+        status_manager = None
+        playback_system = None
 
         try:
             logger.info(f"Starting survey processing for code: {access_code}")
 
-            # Create clean browser
-            driver = self.create_clean_browser()
+            # Create clean browser (or reuse the persistent one in attach mode)
+            driver = self.attach_to_browser() if self.attach else self.create_clean_browser()
 
             # Initialize status indicator
             status_manager = StatusIndicatorManager(driver)
@@ -282,12 +392,15 @@ class BatchSurveyProcessor:
             strategy_file = self.config.get('batch_settings', {}).get('strategy_file', "scenarios/optimized_survey_strategy.json")
             logger.info(f"Using strategy file: {strategy_file}")
 
-            # Create SmartPlaybackSystem with strategy file
+            # Create SmartPlaybackSystem with strategy file (imported here to keep --help/--dry-run fast)
+            from smart_playback_system import SmartPlaybackSystem
             playback_system = SmartPlaybackSystem(strategy_file=strategy_file)
             playback_system.driver = driver
             playback_system.status_manager = status_manager
             playback_system.session_stats["start_time"] = datetime.now().isoformat()
             playback_system.user_birth_year = birth_year
+            playback_system.install_page_tracker()
+            playback_system.register_strategy_scripts()
             logger.debug(f"Set birth year to {birth_year} for survey processing")
 
             # Enable random matrix rating if configured
@@ -305,6 +418,9 @@ class BatchSurveyProcessor:
                 for strategy_name in ['MATRIX_RATING_A6', 'MATRIX_RATING_A5']:
                     if strategy_name in default_strategies:
                         default_strategies[strategy_name]['priority'] = 0  # Lower priority
+
+                # Strategy keyword matchers are precomputed at load - refresh them
+                playback_system.rebuild_strategy_index()
             else:
                 logger.debug("Using fixed matrix ratings (A6/A5)")
 
@@ -336,32 +452,20 @@ class BatchSurveyProcessor:
                         logger.error(f"Failed to process page {page_count}")
                         # Try to continue to next page anyway
 
-                    # Check if final submit was clicked
-                    current_url = driver.current_url
-                    page_source = driver.page_source
-
-                    # Check for official completion page with specific div (after final submit was processed)
-                    try:
-                        completion_div = driver.find_element(By.CSS_SELECTOR, "div.completed-wrapper")
-                        completion_text_div = driver.find_element(By.CSS_SELECTOR, "div.completed-text")
-                        if completion_div and completion_text_div:
-                            logger.success("🎉 SURVEY COMPLETED - Official completion page detected!")
-                            completion_text = completion_text_div.text
-                            logger.info(f"✅ Completion message: {completion_text[:100]}")
-                            break
-                    except:
-                        pass
+                    # Check if final submit was clicked - official completion page, URL and phrases in one call
+                    completion = driver.execute_script(self.COMPLETION_CHECK_JS, self.COMPLETION_PHRASES)
+                    if completion and completion.get('official'):
+                        logger.success("🎉 SURVEY COMPLETED - Official completion page detected!")
+                        logger.info(f"✅ Completion message: {(completion.get('text') or '')[:100]}")
+                        break
 
                     # Fallback: If we just completed final submit, break immediately
-                    if ("děkujeme" in page_source.lower() or
-                        "vaše odpovědi byly v pořádku uloženy" in page_source.lower() or
-                        "dokončeno" in page_source.lower() or
-                        "completed" in current_url.lower() or
-                        "thank" in page_source.lower()):
+                    if completion:
                         logger.success("🎉 SURVEY COMPLETED - Thank you page detected!")
                         break
 
-                    time.sleep(1)
+                    # Continue as soon as the next page is ready instead of a fixed pause
+                    playback_system.wait_for_page_ready(1)
 
                     if page_count >= max_pages:
                         logger.warning(f"Reached maximum pages limit: {max_pages}")
@@ -399,8 +503,16 @@ class BatchSurveyProcessor:
             logger.error(f"Survey processing failed for code {access_code}: {e}")
 
         finally:
-            # Always cleanup browser
-            if driver:
+            # The attached session is reused by the next survey - drop this survey's new-document scripts
+            # so they don't pile up on every page load
+            if driver and self.attach:
+                if playback_system is not None:
+                    playback_system.remove_page_scripts()
+                if status_manager is not None:
+                    status_manager.unregister_new_documents()
+
+            # Always cleanup browser - a persistent browser stays open for the next survey
+            if driver and not self.attach:
                 try:
                     driver.quit()
                     logger.debug("Browser cleaned up successfully")
@@ -509,11 +621,13 @@ def main():
     parser = argparse.ArgumentParser(description='Batch Survey Processor')
     parser.add_argument('--config', default='config/batch_config.json', help='Configuration file path')
     parser.add_argument('--dry-run', action='store_true', help='Test configuration without processing surveys')
+    parser.add_argument('--attach', action='store_true',
+                        help=f'Reuse persistent Chrome on debug port {Config.CHROME_DEBUG_PORT} instead of starting one per survey')
 
     args = parser.parse_args()
 
     try:
-        processor = BatchSurveyProcessor(args.config)
+        processor = BatchSurveyProcessor(args.config, attach=args.attach)
 
         if args.dry_run:
             logger.info("DRY RUN MODE - Configuration test")
@@ -7,6 +7,11 @@ import json
 import sys
 from pathlib import Path
 
+try:
+    import orjson  # Optional: faster JSON load/dump
+except ImportError:
+    orjson = None
+
 def load_codes_from_file(codes_file: str, config_file: str = "config/batch_config.json"):
     """Load access codes from text file and update batch config"""
 
@@ -28,8 +33,12 @@ def load_codes_from_file(codes_file: str, config_file: str = "config/batch_confi
 
     # Load existing config
     try:
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        if orjson is not None:
+            with open(config_file, 'rb') as f:
+                config = orjson.loads(f.read())
+        else:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                config = json.load(f)
     except Exception as e:
         print(f"Error reading config file: {e}")
         return False
@@ -39,8 +48,12 @@ def load_codes_from_file(codes_file: str, config_file: str = "config/batch_confi
 
     # Save updated config
     try:
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            with open(config_file, 'wb') as f:
+                f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+        else:
+            with open(config_file, 'w', encoding='utf-8') as f:
+                json.dump(config, f, indent=2, ensure_ascii=False)
 
         print(f"Updated {config_file} with {len(codes)} access codes")
         return True
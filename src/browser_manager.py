@@ -28,24 +28,39 @@ except ImportError:
 class BrowserManager:
     """Manages persistent browser instances for recorder reuse"""
 
+    # Seconds a successful debug port probe is trusted before asking again
+    PROBE_TTL = 2.0
+
     def __init__(self, debug_port: int = None, user_data_dir: str = None):
         self.debug_port = debug_port or Config.CHROME_DEBUG_PORT
         self.user_data_dir = user_data_dir or Config.CHROME_USER_DATA_DIR
         self.driver: Optional[webdriver.Chrome] = None
+        self._last_probe_ok = 0.0
 
     def is_browser_running(self) -> bool:
         """Check if Chrome is running on our debug port"""
+        # Only positive results are cached - a browser that was just found is not re-probed
+        if time.monotonic() - self._last_probe_ok < self.PROBE_TTL:
+            return True
         try:
             response = requests.get(f"http://localhost:{self.debug_port}/json/version", timeout=2)
-            return response.status_code == 200
+            if response.status_code == 200:
+                self._last_probe_ok = time.monotonic()
+                return True
+            return False
         except:
             return False
 
+    def invalidate_probe(self):
+        """Forget the cached debug port probe result"""
+        self._last_probe_ok = 0.0
+
     def get_browser_info(self) -> Optional[Dict[str, Any]]:
         """Get information about running browser"""
         try:
             response = requests.get(f"http://localhost:{self.debug_port}/json/version", timeout=2)
             if response.status_code == 200:
+                self._last_probe_ok = time.monotonic()
                 return response.json()
         except Exception as e:
             logger.debug(f"Could not get browser info: {e}")
@@ -80,7 +95,11 @@ class BrowserManager:
             chrome_options.add_argument("--disable-dev-shm-usage")
 
             if Config.BROWSER_HEADLESS:
-                chrome_options.add_argument("--headless")
+                chrome_options.add_argument("--headless=new")
+                chrome_options.add_argument("--disable-extensions")
+
+            if Config.BROWSER_DISABLE_IMAGES:
+                chrome_options.add_argument("--blink-settings=imagesEnabled=false")
 
             # Keep browser alive
             chrome_options.add_experimental_option("detach", True)
@@ -120,12 +139,11 @@ class BrowserManager:
     def get_or_create_browser(self, keep_alive: bool = True) -> Optional[webdriver.Chrome]:
         """Get existing browser or create new one"""
 
-        # Check if browser is already running
-        if self.is_browser_running():
+        # Check if browser is already running - the version request doubles as the probe
+        browser_info = self.get_browser_info()
+        if browser_info:
             logger.info("Found existing browser, connecting...")
-            browser_info = self.get_browser_info()
-            if browser_info:
-                logger.info(f"Browser version: {browser_info.get('Browser', 'unknown')}")
+            logger.info(f"Browser version: {browser_info.get('Browser', 'unknown')}")
 
             tabs = self.get_active_tabs()
             logger.info(f"Found {len(tabs)} active tabs")
@@ -142,6 +160,7 @@ class BrowserManager:
                 except Exception as e:
                     logger.warning(f"Connected but communication failed: {e}")
                     driver.quit()
+            self.invalidate_probe()
 
         # Start new browser
         logger.info("Starting new persistent browser...")
@@ -173,6 +192,7 @@ class BrowserManager:
                 logger.info("Browser closed completely")
             except Exception as e:
                 logger.error(f"Error force closing browser: {e}")
+        self.invalidate_probe()
 
         # Kill any remaining Chrome processes on our port
         try:
@@ -14,31 +14,49 @@ PROJECT_ROOT = Path(__file__).parent.parent.absolute()
 class Config:
     """Centralized configuration class for all Evaluace Filler components"""
 
+    # Environment-backed settings - values are read in refresh()
+
     # Browser Configuration
-    CHROME_DEBUG_PORT: int = int(os.getenv('CHROME_DEBUG_PORT', '9222'))
-    CHROME_USER_DATA_DIR: str = os.getenv('CHROME_USER_DATA_DIR', str(Path(tempfile.gettempdir()) / "chrome_evaluace"))
-    # CHROMEDRIVER_PATH: Removed - now using webdriver-manager for automatic chromedriver management
+    CHROME_DEBUG_PORT: int
+    CHROME_USER_DATA_DIR: str
 
     # Browser Options
-    BROWSER_WINDOW_SIZE: str = os.getenv('BROWSER_WINDOW_SIZE', '800,600')
-    BROWSER_WINDOW_POSITION: str = os.getenv('BROWSER_WINDOW_POSITION', '0,0')
-    BROWSER_HEADLESS: bool = os.getenv('BROWSER_HEADLESS', 'false').lower() == 'true'
-    BROWSER_TIMEOUT: int = int(os.getenv('BROWSER_TIMEOUT', '30'))
+    BROWSER_WINDOW_SIZE: str
+    BROWSER_WINDOW_POSITION: str
+    BROWSER_HEADLESS: bool
+    BROWSER_TIMEOUT: int
+    BROWSER_DISABLE_IMAGES: bool
 
     # Survey Configuration
-    SURVEY_BASE_URL: str = os.getenv('SURVEY_BASE_URL', '')
-    SURVEY_ACCESS_CODE: str = os.getenv('SURVEY_ACCESS_CODE', '')
+    SURVEY_BASE_URL: str
+    SURVEY_ACCESS_CODE: str
 
     # Timing Configuration
-    PAGE_LOAD_TIMEOUT: int = int(os.getenv('PAGE_LOAD_TIMEOUT', '30'))
-    ELEMENT_WAIT_TIMEOUT: int = int(os.getenv('ELEMENT_WAIT_TIMEOUT', '10'))
-    NAVIGATION_DELAY: float = float(os.getenv('NAVIGATION_DELAY', '3.0'))
-    FORM_FILL_DELAY: float = float(os.getenv('FORM_FILL_DELAY', '1.0'))
+    PAGE_LOAD_TIMEOUT: int
+    ELEMENT_WAIT_TIMEOUT: int
+    NAVIGATION_DELAY: float
+    FORM_FILL_DELAY: float
 
     # Logging Configuration
-    LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO')
-    LOG_FILE: str = os.getenv('LOG_FILE', str(PROJECT_ROOT / 'logs' / 'evaluace_filler.log'))
-    ENABLE_DEBUG_LOGS: bool = os.getenv('ENABLE_DEBUG_LOGS', 'false').lower() == 'true'
+    LOG_LEVEL: str
+    LOG_FILE: str
+    ENABLE_DEBUG_LOGS: bool
+
+    # JavaScript Configuration
+    JS_EXECUTION_TIMEOUT: int
+    JS_CACHE_ENABLED: bool
+
+    # Batch Processing Configuration
+    BATCH_SIZE: int
+    BATCH_PARALLEL_WORKERS: int
+    BATCH_RETRY_COUNT: int
+    BATCH_INTERACTIVE: bool
+
+    # Playback Configuration
+    PLAYBACK_RANDOM_MATRIX: bool
+    PLAYBACK_ENABLE_SCREENSHOTS: bool
+    PLAYBACK_SCREENSHOT_DIR: str
+    PLAYBACK_MAX_PAGES: int
 
     # Paths Configuration
     SCENARIOS_DIR: Path = PROJECT_ROOT / 'scenarios'
@@ -46,20 +64,53 @@ class Config:
     LOGS_DIR: Path = PROJECT_ROOT / 'logs'
     JS_SCRIPTS_DIR: Path = PROJECT_ROOT / 'src' / 'js_scripts'
 
-    # JavaScript Configuration
-    JS_EXECUTION_TIMEOUT: int = int(os.getenv('JS_EXECUTION_TIMEOUT', '30'))
-    JS_CACHE_ENABLED: bool = os.getenv('JS_CACHE_ENABLED', 'true').lower() == 'true'
-
-    # Batch Processing Configuration
-    BATCH_SIZE: int = int(os.getenv('BATCH_SIZE', '50'))
-    BATCH_PARALLEL_WORKERS: int = int(os.getenv('BATCH_PARALLEL_WORKERS', '1'))
-    BATCH_RETRY_COUNT: int = int(os.getenv('BATCH_RETRY_COUNT', '3'))
-
-    # Playback Configuration
-    PLAYBACK_RANDOM_MATRIX: bool = os.getenv('PLAYBACK_RANDOM_MATRIX', 'true').lower() == 'true'
-    PLAYBACK_ENABLE_SCREENSHOTS: bool = os.getenv('PLAYBACK_ENABLE_SCREENSHOTS', 'false').lower() == 'true'
-    PLAYBACK_SCREENSHOT_DIR: str = os.getenv('PLAYBACK_SCREENSHOT_DIR', str(PROJECT_ROOT / 'screenshots'))
-    PLAYBACK_MAX_PAGES: int = int(os.getenv('PLAYBACK_MAX_PAGES', '0'))  # 0 = unlimited
+    @classmethod
+    def refresh(cls):
+        """Re-read environment-backed settings (after load_from_env_file() or an os.environ override)"""
+        # Browser Configuration
+        cls.CHROME_DEBUG_PORT = int(os.getenv('CHROME_DEBUG_PORT', '9222'))
+        cls.CHROME_USER_DATA_DIR = os.getenv('CHROME_USER_DATA_DIR', str(Path(tempfile.gettempdir()) / "chrome_evaluace"))
+        # CHROMEDRIVER_PATH: Removed - now using webdriver-manager for automatic chromedriver management
+
+        # Browser Options
+        cls.BROWSER_WINDOW_SIZE = os.getenv('BROWSER_WINDOW_SIZE', '800,600')
+        cls.BROWSER_WINDOW_POSITION = os.getenv('BROWSER_WINDOW_POSITION', '0,0')
+        cls.BROWSER_HEADLESS = os.getenv('BROWSER_HEADLESS', 'false').lower() == 'true'
+        cls.BROWSER_TIMEOUT = int(os.getenv('BROWSER_TIMEOUT', '30'))
+        # Skip image downloads - automation only reads the DOM (CSS stays on, visibility checks need it)
+        cls.BROWSER_DISABLE_IMAGES = os.getenv('BROWSER_DISABLE_IMAGES', 'false').lower() == 'true'
+
+        # Survey Configuration
+        cls.SURVEY_BASE_URL = os.getenv('SURVEY_BASE_URL', '')
+        cls.SURVEY_ACCESS_CODE = os.getenv('SURVEY_ACCESS_CODE', '')
+
+        # Timing Configuration
+        cls.PAGE_LOAD_TIMEOUT = int(os.getenv('PAGE_LOAD_TIMEOUT', '30'))
+        cls.ELEMENT_WAIT_TIMEOUT = int(os.getenv('ELEMENT_WAIT_TIMEOUT', '10'))
+        cls.NAVIGATION_DELAY = float(os.getenv('NAVIGATION_DELAY', '3.0'))
+        cls.FORM_FILL_DELAY = float(os.getenv('FORM_FILL_DELAY', '1.0'))
+
+        # Logging Configuration
+        cls.LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+        cls.LOG_FILE = os.getenv('LOG_FILE', str(PROJECT_ROOT / 'logs' / 'evaluace_filler.log'))
+        cls.ENABLE_DEBUG_LOGS = os.getenv('ENABLE_DEBUG_LOGS', 'false').lower() == 'true'
+
+        # JavaScript Configuration
+        cls.JS_EXECUTION_TIMEOUT = int(os.getenv('JS_EXECUTION_TIMEOUT', '30'))
+        cls.JS_CACHE_ENABLED = os.getenv('JS_CACHE_ENABLED', 'true').lower() == 'true'
+
+        # Batch Processing Configuration
+        cls.BATCH_SIZE = int(os.getenv('BATCH_SIZE', '50'))
+        cls.BATCH_PARALLEL_WORKERS = int(os.getenv('BATCH_PARALLEL_WORKERS', '1'))
+        cls.BATCH_RETRY_COUNT = int(os.getenv('BATCH_RETRY_COUNT', '3'))
+        # Prompt for a valid code on an invalid one (false = fail the survey and continue, for unattended runs)
+        cls.BATCH_INTERACTIVE = os.getenv('BATCH_INTERACTIVE', 'true').lower() == 'true'
+
+        # Playback Configuration
+        cls.PLAYBACK_RANDOM_MATRIX = os.getenv('PLAYBACK_RANDOM_MATRIX', 'true').lower() == 'true'
+        cls.PLAYBACK_ENABLE_SCREENSHOTS = os.getenv('PLAYBACK_ENABLE_SCREENSHOTS', 'false').lower() == 'true'
+        cls.PLAYBACK_SCREENSHOT_DIR = os.getenv('PLAYBACK_SCREENSHOT_DIR', str(PROJECT_ROOT / 'screenshots'))
+        cls.PLAYBACK_MAX_PAGES = int(os.getenv('PLAYBACK_MAX_PAGES', '0'))  # 0 = unlimited
 
     @classmethod
     def get_chrome_options(cls) -> Dict[str, Any]:
@@ -103,8 +154,9 @@ class Config:
         ]
 
         for path in paths_to_create:
-            if path and not path.exists():
+            if path:
                 try:
+                    # exist_ok makes a separate exists() check redundant
                     path.mkdir(parents=True, exist_ok=True)
                 except Exception as e:
                     print(f"Failed to create directory {path}: {e}")
@@ -128,6 +180,7 @@ class Config:
                     if line and not line.startswith('#') and '=' in line:
                         key, value = line.split('=', 1)
                         os.environ[key.strip()] = value.strip().strip('"\'')
+            cls.refresh()
             return True
         except Exception as e:
             print(f"Failed to load .env file: {e}")
@@ -152,6 +205,9 @@ class Config:
         print("=" * 50)
 
 
+# Read environment-backed settings
+Config.refresh()
+
 # Default configuration instance
 config = Config()
 
@@ -172,12 +228,19 @@ def main():
     # Test environment variable override
     print("\n🧪 Testing environment variable override...")
     original_port = Config.CHROME_DEBUG_PORT
+    original_env = os.environ.get('CHROME_DEBUG_PORT')
     os.environ['CHROME_DEBUG_PORT'] = '9999'
 
-    # Create new config instance to test override
-    test_config = Config()
+    # Re-read settings instead of reloading the module
+    Config.refresh()
     print(f"Original port: {original_port}")
-    print(f"Override port: {test_config.CHROME_DEBUG_PORT}")
+    print(f"Override port: {Config.CHROME_DEBUG_PORT}")
+
+    if original_env is None:
+        del os.environ['CHROME_DEBUG_PORT']
+    else:
+        os.environ['CHROME_DEBUG_PORT'] = original_env
+    Config.refresh()
 
     # Test path validation
     print("\n📁 Testing path validation...")
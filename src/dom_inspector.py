@@ -28,6 +28,29 @@ from utils.navigation_manager import NavigationManager
 class DOMInspector:
     """Interactive DOM inspector for real dotazník analysis"""
 
+    PAGE_SUMMARY_JS = """
+    return {url: location.href, title: document.title, length: document.documentElement.outerHTML.length};
+    """
+
+    # Count and first 3 texts for every selector in one call (instead of find_elements + .text per element)
+    SELECTOR_PROBE_JS = """
+    var found = {};
+    arguments[0].forEach(function(selector) {
+        try {
+            var elements = document.querySelectorAll(selector);
+            found[selector] = {
+                count: elements.length,
+                texts: Array.prototype.slice.call(elements, 0, 3).map(function(element) {
+                    return (element.innerText || '').trim().substring(0, 50);
+                })
+            };
+        } catch (e) {
+            found[selector] = {error: String(e)};
+        }
+    });
+    return found;
+    """
+
     def __init__(self, headless: bool = False):
         self.driver: Optional[webdriver.Chrome] = None
         self.navigation_manager: Optional[NavigationManager] = None
@@ -44,12 +67,14 @@ class DOMInspector:
                 chrome_options.add_experimental_option('useAutomationExtension', False)
                 chrome_options.add_argument("--window-size=1200,800")
             else:
-                chrome_options.add_argument("--headless")
+                chrome_options.add_argument("--headless=new")
+                chrome_options.add_argument("--disable-extensions")
 
             # Standard Chrome options
             chrome_options.add_argument("--disable-gpu")
             chrome_options.add_argument("--no-sandbox")
             chrome_options.add_argument("--disable-dev-shm-usage")
+            chrome_options.page_load_strategy = 'eager'  # Don't block navigation on images/subresources
 
             # Try to use system ChromeDriver first
             try:
@@ -87,13 +112,15 @@ class DOMInspector:
 
     def analyze_current_page(self) -> Dict[str, Any]:
         """Analyze current page with our utilities"""
+        # Page length is measured in the browser - the page source itself is not transferred
+        page = self.driver.execute_script(self.PAGE_SUMMARY_JS)
         analysis = {
-            "url": self.driver.current_url,
-            "title": self.driver.title,
+            "url": page["url"],
+            "title": page["title"],
             "page_id": None,
             "navigation_buttons": {},
             "selectors_found": {},
-            "page_source_length": len(self.driver.page_source)
+            "page_source_length": page["length"]
         }
 
         try:
@@ -113,15 +140,10 @@ class DOMInspector:
                 "#ls-button-previous"
             ]
 
-            for selector in selectors_to_test:
-                try:
-                    elements = self.driver.find_elements("css selector", selector)
-                    analysis["selectors_found"][selector] = {
-                        "count": len(elements),
-                        "texts": [elem.text.strip()[:50] for elem in elements[:3]]  # First 3 elements
-                    }
-                except Exception as e:
-                    analysis["selectors_found"][selector] = {"error": str(e)}
+            try:
+                analysis["selectors_found"] = self.driver.execute_script(self.SELECTOR_PROBE_JS, selectors_to_test)
+            except Exception as e:
+                analysis["selectors_found"] = {selector: {"error": str(e)} for selector in selectors_to_test}
 
             # Test NavigationManager
             logger.info("Testing NavigationManager...")
@@ -6,6 +6,7 @@ Records user interactions on dotazník pages using JavaScript injection.
 Captures clicks, inputs, and navigation with precise element selectors.
 """
 
+import os
 import json
 import time
 import uuid
@@ -77,7 +78,6 @@ class RecordingSession:
             "actions": self.actions
         }
 
-        import os
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
 
         with open(filepath, 'w', encoding='utf-8') as f:
@@ -5,65 +5,107 @@
  * - A6 (Souhlasím) for regular inclusion questions
  */
 
+var A1_SELECTOR = 'input[type="radio"][id*="-A1"]';
+var A6_SELECTOR = 'input[type="radio"][id*="-A6"]';
+
+function escapeRegExp(text) {
+    return text.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+}
+
 function executeBarrierFreeInclusion(barrierKeywords) {
     console.log('🔍 EXECUTING IMPROVED BARRIER-FREE STRATEGY');
     var barrierCount = 0;
     var regularCount = 0;
     var totalProcessed = 0;
 
-    // Find all A1 and A6 radio buttons
-    var allA1 = document.querySelectorAll('input[type="radio"][id*="-A1"]');
-    var allA6 = document.querySelectorAll('input[type="radio"][id*="-A6"]');
-    console.log('🔘 Total A1 radios:', allA1.length, 'A6 radios:', allA6.length);
+    // One case-insensitive alternation instead of an includes() probe per keyword
+    var barrierRe = barrierKeywords.length > 0
+        ? new RegExp(barrierKeywords.map(escapeRegExp).join('|'), 'i')
+        : null;
 
-    // Look through table rows for barrier-free keywords
-    var tableRows = document.querySelectorAll('tr');
+    // Find all A1 and A6 radio buttons in one query and group them by table row
+    var radiosByRow = new Map();
+    var allA6 = [];
+    var a1Total = 0;
+    document.querySelectorAll(A1_SELECTOR + ', ' + A6_SELECTOR).forEach(function(radio) {
+        var row = radio.closest('tr');
+        var entry = radiosByRow.get(row);
+        if (!entry) {
+            entry = {a1: null};
+            radiosByRow.set(row, entry);
+        }
 
-    tableRows.forEach(function(row, index) {
-        var rowText = row.textContent.toLowerCase();
-        var hasBarrierKeyword = barrierKeywords.some(function(keyword) {
-            return rowText.includes(keyword.toLowerCase());
-        });
+        if (radio.id.indexOf('-A1') !== -1) {
+            entry.a1 = entry.a1 || radio;
+            a1Total++;
+        } else {
+            allA6.push({radio: radio, row: row});
+        }
+    });
+    console.log('🔘 Total A1 radios:', a1Total, 'A6 radios:', allA6.length);
 
-        if (hasBarrierKeyword) {
-            console.log('🎯 BARRIER-FREE FOUND in row:', index + 1, rowText.substring(0, 50) + '...');
-
-            // Look for A1 in this row and nearby elements
-            var a1InRow = row.querySelector('input[type="radio"][id*="-A1"]');
-            var a1InNext = row.nextElementSibling ? row.nextElementSibling.querySelector('input[type="radio"][id*="-A1"]') : null;
-            var a1InParent = row.parentElement.querySelector('input[type="radio"][id*="-A1"]');
-
-            // Try to click any A1 we find
-            var targetA1 = a1InRow || a1InNext || a1InParent;
-            if (targetA1 && !targetA1.checked) {
-                console.log('✅ CLICKING A1:', targetA1.id);
-                targetA1.click();
-                barrierCount++;
-                totalProcessed++;
+    // Candidate rows come from the radio grouping instead of a walk over every <tr>:
+    // rows holding radios, plus the row just before each (question text may sit above its radios)
+    var candidateRows = [];
+    var seenRows = new Set();
+    radiosByRow.forEach(function(entry, row) {
+        if (!row) {
+            return;
+        }
+        [row.previousElementSibling, row].forEach(function(candidate) {
+            if (candidate && candidate.tagName === 'TR' && !seenRows.has(candidate)) {
+                seenRows.add(candidate);
+                candidateRows.push(candidate);
             }
+        });
+    });
+
+    // Read phase: look through candidate rows for barrier-free keywords - each row's text is tested once
+    var barrierRows = new Set();
+    var a1Targets = [];
+
+    candidateRows.forEach(function(row, index) {
+        if (!barrierRe) {
+            return;
+        }
+
+        var rowEntry = radiosByRow.get(row);
+        var nextEntry = row.nextElementSibling ? radiosByRow.get(row.nextElementSibling) : null;
+
+        var rowText = row.textContent;
+        if (!barrierRe.test(rowText)) {
+            return;
+        }
+        barrierRows.add(row);
+
+        console.log('🎯 BARRIER-FREE FOUND in row:', index + 1, rowText.trim().substring(0, 50) + '...');
+
+        // Look for A1 in this row and nearby elements
+        var targetA1 = (rowEntry && rowEntry.a1) ||
+                       (nextEntry && nextEntry.a1) ||
+                       row.parentElement.querySelector(A1_SELECTOR);
+        if (targetA1) {
+            a1Targets.push(targetA1);
         }
     });
 
-    // Handle regular (non-barrier) questions with A6
-    allA6.forEach(function(a6Radio) {
-        if (!a6Radio.checked) {
-            // Check if this A6 belongs to a barrier-free question
-            var rowElement = a6Radio.closest('tr');
-            var isBarrierFree = false;
-
-            if (rowElement) {
-                var rowText = rowElement.textContent.toLowerCase();
-                isBarrierFree = barrierKeywords.some(function(keyword) {
-                    return rowText.includes(keyword.toLowerCase());
-                });
-            }
+    // Write phase: all clicks happen after all text reads, so no read forces a re-layout
+    a1Targets.forEach(function(targetA1) {
+        if (!targetA1.checked) {
+            console.log('✅ CLICKING A1:', targetA1.id);
+            targetA1.click();
+            barrierCount++;
+            totalProcessed++;
+        }
+    });
 
-            // Only click A6 if it's NOT a barrier-free question
-            if (!isBarrierFree) {
-                a6Radio.click();
-                regularCount++;
-                totalProcessed++;
-            }
+    // Handle regular (non-barrier) questions with A6
+    allA6.forEach(function(item) {
+        // Only click A6 if it's NOT a barrier-free question
+        if (!item.radio.checked && !barrierRows.has(item.row)) {
+            item.radio.click();
+            regularCount++;
+            totalProcessed++;
         }
     });
 
@@ -72,6 +114,7 @@ function executeBarrierFreeInclusion(barrierKeywords) {
     return {
         barrier_free_a1: barrierCount,
         regular_a6: regularCount,
-        total_processed: totalProcessed
+        total_processed: totalProcessed,
+        success: true
     };
-}
\ No newline at end of file
+}
@@ -48,6 +48,7 @@ function executeCheckboxStrategy(selectedIndices) {
         total: checkboxes.length,
         clicked: clickedCount,
         targetSelected: finalSelected,
-        requiredCount: targetIndices.length
+        requiredCount: targetIndices.length,
+        success: finalSelected === targetIndices.length
     };
 }
\ No newline at end of file
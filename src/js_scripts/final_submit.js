@@ -0,0 +1,42 @@
+/**
+ * Final Submit JavaScript
+ * Finds the first enabled and visible final submit button and clicks it in one call
+ */
+
+function executeFinalSubmit() {
+    var finalSubmitSelectors = [
+        '#ls-button-submit',                        // Primary selector for final submit
+        'button[value="movesubmit"][name="move"]',  // Specific final submit button
+        'input[type="submit"][value*="Odeslat"]',
+        'button[type="submit"]'
+    ];
+
+    function isClickable(button) {
+        return !button.disabled && button.offsetParent !== null;
+    }
+
+    for (var i = 0; i < finalSubmitSelectors.length; i++) {
+        var selector = finalSubmitSelectors[i];
+        var button = document.querySelector(selector);
+
+        if (button && isClickable(button)) {
+            console.log('Clicking final submit button:', selector);
+            button.click();
+            return {success: true, selector: selector};
+        }
+    }
+
+    // Button with "Odeslat" text (no CSS equivalent of :contains)
+    var textButton = Array.from(document.querySelectorAll('button')).find(function(button) {
+        return button.textContent.includes('Odeslat') && isClickable(button);
+    });
+
+    if (textButton) {
+        console.log('Clicking final submit button by text: Odeslat');
+        textButton.click();
+        return {success: true, selector: 'button text "Odeslat"'};
+    }
+
+    console.log('No final submit button found');
+    return {success: false, selector: null};
+}
@@ -14,39 +14,43 @@ function executeMatrixRandomStrategy(ratingOptions) {
         ratingCounts[rating] = 0;
     });
 
-    // Find all radio button groups (matrix rows)
-    var processedRows = new Set();
-    var allRadios = document.querySelectorAll('input[type="radio"]');
-
-    allRadios.forEach(function(radio) {
+    // Group all radio buttons into matrix rows in one pass, indexing them by name/value
+    // so each row's target is a map lookup instead of another document query
+    var rows = new Map();
+    var radiosByNameValue = new Map();
+    document.querySelectorAll('input[type="radio"]').forEach(function(radio) {
         // Extract row identifier from radio name/id
         var rowId = radio.name || radio.id.split('-')[0];
+        if (!rows.has(rowId)) {
+            rows.set(rowId, radio);
+        }
 
-        if (!processedRows.has(rowId)) {
-            processedRows.add(rowId);
+        var key = radio.name + '\u0000' + radio.value;
+        if (radio.name && !radiosByNameValue.has(key)) {
+            radiosByNameValue.set(key, radio);
+        }
+    });
 
-            // Randomly select rating for this row
-            var randomRating = ratingOptions[Math.floor(Math.random() * ratingOptions.length)];
+    rows.forEach(function(radio, rowId) {
+        // Randomly select rating for this row
+        var randomRating = ratingOptions[Math.floor(Math.random() * ratingOptions.length)];
 
-            // Find radio for this rating in this row
-            var targetRadio = document.querySelector(
-                'input[type="radio"][name="' + rowId + '"][value="' + randomRating + '"]'
-            );
+        // Find radio for this rating in this row
+        var targetRadio = radiosByNameValue.get(rowId + '\u0000' + randomRating);
 
-            if (!targetRadio && radio.id) {
-                // Fallback: try to find by ID pattern
-                var baseId = radio.id.split('-')[0];
-                targetRadio = document.querySelector('#' + baseId + '-' + randomRating);
-            }
+        if (!targetRadio && radio.id) {
+            // Fallback: try to find by ID pattern
+            var baseId = radio.id.split('-')[0];
+            targetRadio = document.getElementById(baseId + '-' + randomRating);
+        }
 
-            if (targetRadio) {
-                if (!targetRadio.checked) {
-                    targetRadio.click();
-                    totalClicked++;
-                    ratingCounts[randomRating]++;
-                } else {
-                    totalAlready++;
-                }
+        if (targetRadio) {
+            if (!targetRadio.checked) {
+                targetRadio.click();
+                totalClicked++;
+                ratingCounts[randomRating]++;
+            } else {
+                totalAlready++;
             }
         }
     });
@@ -55,6 +59,7 @@ function executeMatrixRandomStrategy(ratingOptions) {
         total_clicked: totalClicked,
         total_already: totalAlready,
         rating_distribution: ratingCounts,
-        total_processed: totalClicked + totalAlready
+        total_processed: totalClicked + totalAlready,
+        success: totalClicked + totalAlready > 0
     };
 }
\ No newline at end of file
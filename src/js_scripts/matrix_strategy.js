@@ -31,6 +31,7 @@ function executeMatrixStrategy(ratingLevel) {
         total: radios.length,
         clicked: clicked,
         alreadySelected: alreadySelected,
-        totalSelected: totalSelected
+        totalSelected: totalSelected,
+        success: radios.length > 0 && totalSelected === radios.length
     };
 }
\ No newline at end of file
@@ -0,0 +1,57 @@
+/**
+ * Page ID Tracker JavaScript
+ * Keeps window.__pageId in sync with the current question text using a MutationObserver.
+ * Mutations only mark the id stale; it is recomputed lazily when window.__pageId is read.
+ * Selectors mirror PageIdentifier (primary question selector first, then fallbacks).
+ */
+
+function installPageIdTracker() {
+    if (window.__pageIdTracker) {
+        return {success: true, installed: false, pageId: window.__pageId};
+    }
+
+    var pageSelectors = [
+        '.question-text .ls-label-question',
+        'h1',
+        'h2',
+        '.page-title',
+        '.ls-page-title',
+        '.ls-page-header h1',
+        '.ls-page-header h2',
+        '.main-title'
+    ];
+
+    function computePageId() {
+        for (var i = 0; i < pageSelectors.length; i++) {
+            var element = document.querySelector(pageSelectors[i]);
+            if (element) {
+                var text = (element.innerText || element.textContent || '').trim();
+                if (text) {
+                    return text;
+                }
+            }
+        }
+        return null;
+    }
+
+    var pageId = null;
+    var stale = true;
+
+    Object.defineProperty(window, '__pageId', {
+        configurable: true,
+        get: function() {
+            if (stale) {
+                pageId = computePageId();
+                stale = false;
+            }
+            return pageId;
+        }
+    });
+
+    window.__pageIdTracker = new MutationObserver(function() {
+        stale = true;
+    });
+    window.__pageIdTracker.observe(document, {childList: true, subtree: true, characterData: true});
+
+    return {success: true, installed: true, pageId: window.__pageId};
+}
@@ -7,6 +7,10 @@ window.AutomationStatusIndicator = {
     // Status bar element reference
     statusBar: null,
 
+    // Child element references, set once in create()
+    textElement: null,
+    closeButton: null,
+
     // Current status
     currentStatus: 'inactive',
 
@@ -109,6 +113,7 @@ window.AutomationStatusIndicator = {
         const textSpan = document.createElement('span');
         textSpan.id = 'status-text';
         this.statusBar.appendChild(textSpan);
+        this.textElement = textSpan;
 
         // Create close button (hidden by default)
         const closeButton = document.createElement('button');
@@ -131,6 +136,7 @@ window.AutomationStatusIndicator = {
         `;
         closeButton.onclick = () => this.hide();
         this.statusBar.appendChild(closeButton);
+        this.closeButton = closeButton;
 
         // Add minimal CSS styles (no animations)
         const style = document.createElement('style');
@@ -180,10 +186,9 @@ window.AutomationStatusIndicator = {
         this.statusBar.style.backgroundColor = config.backgroundColor;
         this.statusBar.style.borderBottomColor = config.borderColor;
 
-        // Update text content
-        const textElement = this.statusBar.querySelector('#status-text');
-        if (textElement) {
-            textElement.textContent = customText || config.text;
+        // Update text content - element reference kept from create()
+        if (this.textElement) {
+            this.textElement.textContent = customText || config.text;
         }
 
         // Show the status bar if hidden
@@ -233,6 +238,8 @@ window.AutomationStatusIndicator = {
         }
 
         this.statusBar = null;
+        this.textElement = null;
+        this.closeButton = null;
     },
 
     /**
@@ -268,9 +275,8 @@ window.AutomationStatusIndicator = {
         const result = this.setStatus('manual_required', text);
 
         // Show close button for manual interventions
-        const closeBtn = this.statusBar?.querySelector('#status-close-btn');
-        if (closeBtn) {
-            closeBtn.style.display = 'block';
+        if (this.closeButton) {
+            this.closeButton.style.display = 'block';
         }
 
         return result;
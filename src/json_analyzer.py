@@ -5,13 +5,28 @@ Analyzes recorded survey data for completeness and prepares clean JSON for playb
 """
 
 import json
+from collections import Counter
+from functools import cached_property
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Set, Any
 from loguru import logger
 
 class RecordingSessionAnalyzer:
-    """Analyzes recorded survey sessions for quality and completeness"""
+    """Analyzes recorded survey sessions for quality and completeness
+
+    Sub-analyses are cached properties computed on first access.
+    self.data must not be mutated after __init__, otherwise cached
+    results would go stale.
+    """
+
+    ANALYSIS_SECTIONS = {
+        "session_info": "get_session_info",
+        "page_analysis": "analyze_pages",
+        "action_analysis": "analyze_actions",
+        "selector_analysis": "analyze_selectors",
+        "data_quality": "check_data_quality"
+    }
 
     def __init__(self, session_path: str):
         self.session_path = Path(session_path)
@@ -28,15 +43,9 @@ class RecordingSessionAnalyzer:
 
     def analyze_completeness(self) -> Dict[str, Any]:
         """Analyze session completeness and quality"""
-        analysis = {
-            "session_info": self.get_session_info(),
-            "page_analysis": self.analyze_pages(),
-            "action_analysis": self.analyze_actions(),
-            "selector_analysis": self.analyze_selectors(),
-            "data_quality": self.check_data_quality()
-        }
-        return analysis
+        return {section: getattr(self, attr) for section, attr in self.ANALYSIS_SECTIONS.items()}
 
+    @cached_property
     def get_session_info(self) -> Dict:
         """Extract basic session information"""
         return {
@@ -49,6 +58,7 @@ class RecordingSessionAnalyzer:
             "file_size_kb": round(self.session_path.stat().st_size / 1024, 2)
         }
 
+    @cached_property
     def analyze_pages(self) -> Dict:
         """Analyze page coverage and flow"""
         page_history = self.data.get("page_history", [])
@@ -72,31 +82,24 @@ class RecordingSessionAnalyzer:
             "has_question_pages": any("?" in p.get("page_id", "") for p in page_history)
         }
 
+    @cached_property
     def analyze_actions(self) -> Dict:
         """Analyze recorded actions"""
         actions = self.data.get("actions", [])
 
-        action_types = {}
-        pages_with_actions = set()
-        selectors_used = set()
-
-        for action in actions:
-            action_type = action.get("action_type", "unknown")
-            page_id = action.get("page_id", "unknown")
-            selector = action.get("element_selector", "unknown")
-
-            action_types[action_type] = action_types.get(action_type, 0) + 1
-            pages_with_actions.add(page_id)
-            selectors_used.add(selector)
+        action_types = Counter(action.get("action_type", "unknown") for action in actions)
+        pages_with_actions = {action.get("page_id", "unknown") for action in actions}
+        selectors_used = {action.get("element_selector", "unknown") for action in actions}
 
         return {
             "total_actions": len(actions),
-            "action_types": action_types,
+            "action_types": dict(action_types),
             "pages_with_actions": len(pages_with_actions),
             "unique_selectors": len(selectors_used),
             "actions_per_page": round(len(actions) / max(len(pages_with_actions), 1), 1)
         }
 
+    @cached_property
     def analyze_selectors(self) -> Dict:
         """Analyze selector quality and patterns"""
         actions = self.data.get("actions", [])
@@ -133,6 +136,7 @@ class RecordingSessionAnalyzer:
             "selector_list": list(all_selectors)
         }
 
+    @cached_property
     def check_data_quality(self) -> Dict:
         """Check data quality issues"""
         actions = self.data.get("actions", [])
@@ -244,33 +248,31 @@ class RecordingSessionAnalyzer:
 
     def print_analysis(self):
         """Print comprehensive analysis to console"""
-        analysis = self.analyze_completeness()
-
         print(f"\n📊 ANALYSIS: {self.session_path.name}")
         print("=" * 60)
 
         # Session info
-        info = analysis["session_info"]
+        info = self.get_session_info
         print(f"Session: {info['session_name']}")
         print(f"Actions: {info['total_actions']}")
         print(f"Pages: {info['pages_visited']}")
         print(f"File size: {info['file_size_kb']} KB")
 
         # Actions analysis
-        action_analysis = analysis["action_analysis"]
+        action_analysis = self.analyze_actions
         print(f"\n🎯 ACTIONS ({action_analysis['total_actions']}):")
         for action_type, count in action_analysis["action_types"].items():
             print(f"  {action_type}: {count}")
 
         # Selector analysis
-        selector_analysis = analysis["selector_analysis"]
+        selector_analysis = self.analyze_selectors
         print(f"\n🔍 SELECTORS ({selector_analysis['total_unique_selectors']}):")
         for pattern, count in selector_analysis["selector_patterns"].items():
             if count > 0:
                 print(f"  {pattern}: {count}")
 
         # Data quality
-        quality = analysis["data_quality"]
+        quality = self.check_data_quality
         print(f"\n✅ DATA QUALITY:")
         if quality["has_issues"]:
             for issue in quality["issues"]:
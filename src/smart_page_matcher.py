@@ -38,6 +38,8 @@ class SmartPageMatcher:
         self.pages_index = {}
         self.pattern_cache = {}
         self.keyword_cache = {}
+        # Lowercased (title, keywords) per page - fuzzy matching folds only the current title per call
+        self._folded_pages = []
 
         self.load_scenarios()
         self._build_search_indices()
@@ -69,6 +71,11 @@ class SmartPageMatcher:
                     self.keyword_cache[keyword] = []
                 self.keyword_cache[keyword].append(page_title)
 
+        self._folded_pages = [
+            (page_title, page_title.lower(), [keyword.lower() for keyword in config.get('keywords', [])], config)
+            for page_title, config in pages.items()
+        ]
+
         logger.debug(f"Built indices: {len(self.pages_index)} pages, {len(self.keyword_cache)} keywords")
 
     def find_page_match(self, current_page_title: str, threshold: float = 0.8) -> Optional[PageMatch]:
@@ -97,16 +104,16 @@ class SmartPageMatcher:
         # 2. Fuzzy matching - check similarity with all known pages
         best_match = None
         best_score = 0.0
+        title_lower = current_page_title.lower()
 
-        for known_title, config in self.pages_index.items():
+        for known_title, known_lower, keywords_lower, config in self._folded_pages:
             # Calculate similarity
-            similarity = SequenceMatcher(None, current_page_title.lower(), known_title.lower()).ratio()
+            similarity = SequenceMatcher(None, title_lower, known_lower).ratio()
 
             # Boost score for keyword matches
-            keywords = config.get('keywords', [])
             keyword_boost = 0
-            for keyword in keywords:
-                if keyword.lower() in current_page_title.lower():
+            for keyword in keywords_lower:
+                if keyword in title_lower:
                     keyword_boost += 0.1
 
             final_score = min(similarity + keyword_boost, 1.0)
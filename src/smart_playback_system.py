@@ -7,15 +7,30 @@ Phase 5: Production-ready automated survey filling system
 import sys
 import os
 import json
+import re
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Optional, List
 
 # Add src to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+try:
+    import ahocorasick  # Optional: single-pass keyword matching
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson  # Optional: faster JSON load/dump
+except ImportError:
+    orjson = None
+
 from loguru import logger
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import JavascriptException, TimeoutException, WebDriverException
 from src.browser_manager import BrowserManager
 from src.utils.page_identifier import PageIdentifier
 from src.utils.javascript_loader import JavaScriptLoader
@@ -36,36 +51,98 @@ class SmartPlaybackSystem:
     - Performance monitoring and logging
     """
 
+    # Ready once the clicked page has been replaced by a fully loaded one with a Next button
+    PAGE_READY_SCRIPT = (
+        "return document.readyState === 'complete' && !window.__navigationPending"
+        " && !!document.querySelector('#ls-button-submit');"
+    )
+
+    # Classifies the page HTML: 'saved' (LimeSurvey confirmation), 'generic' (thank-you/completed) or null
+    COMPLETION_TEXT_SCRIPT = """
+    var html = document.documentElement.outerHTML;
+    if (html.indexOf('Vaše odpovědi byly v pořádku uloženy') !== -1) return 'saved';
+    var lower = html.toLowerCase();
+    return (lower.indexOf('děkujeme') !== -1 || lower.indexOf('completed') !== -1) ? 'generic' : null;
+    """
+
+    # Page ID substrings that end the playback loop, matched against the casefolded page ID
+    FINAL_PAGE_INDICATORS = ('dostali jste se na konec', 'dokončení', 'odeslat')
+    _FINAL_PAGE_RE = re.compile('|'.join(re.escape(indicator.casefold()) for indicator in FINAL_PAGE_INDICATORS))
+
+    # Fallback navigation when the strategy config has no navigation_script
+    DEFAULT_NAVIGATION_SCRIPT = """
+    var nextButton = document.querySelector('#ls-button-submit');
+    if (nextButton) {
+        nextButton.click();
+        return {success: true, button: 'found'};
+    } else {
+        return {success: false, button: 'not_found'};
+    }
+    """
+
     def __init__(self, strategy_file: str = "scenarios/optimized_survey_strategy.json"):
         self.browser_manager = BrowserManager()
         self.page_identifier = PageIdentifier()
         self.js_loader = JavaScriptLoader()
         self.status_manager = None  # Will be initialized when driver is available
         self.driver = None
+        self._navigated_in_script = False  # Set when strategy JS already clicked Next
+        self._page_tracker_installed = False
+        self._page_tracker_script_id = None  # CDP identifier of the new-document tracker script
+        self._cdp_available = True  # Cleared after the first failed CDP call (non-Chromium driver)
 
         # Load strategy configuration
         self.strategy_file = strategy_file
         self.strategy_config = {}
+        self._keyword_automaton = None
+        self._special_dispatch = []
+        self._strategy_keywords_folded = []
+        self._barrier_free_strategy = None
+        self._navigation_js = ''
+
+        # Preload JavaScript files (preload_scripts reads them in parallel itself)
+        self.js_loader.preload_scripts()
         self.load_strategy_config()
 
-        # Execution tracking
+        # Strategy pattern -> executor
+        self._strategy_dispatch = {
+            'INCLUSION_MIXED_STRATEGY': self.execute_inclusion_strategy,
+            'MATRIX_RATING': self.execute_matrix_strategy,
+            'MATRIX_RANDOM_RATING': self.execute_matrix_random_strategy,
+            'RADIO_CHOICE': self.execute_radio_strategy,
+            'INPUT_FIELD': self.execute_input_strategy,
+            'CHECKBOX_MULTI': self.execute_checkbox_strategy,
+            'SKIP': self.execute_skip_strategy,
+            'FINAL_PAGE': self.execute_final_page_strategy
+        }
+
+        # Execution tracking - per-page records are streamed to page_log (JSON lines)
+        # Page records carry monotonic offsets (t_ns) from page_log_t0 instead of wall-clock strings
+        self._t0_wall = datetime.now()
+        self._t0_mono = time.monotonic_ns()
+        self.session_timestamp = self._t0_wall.strftime('%Y%m%d_%H%M%S')
         self.session_stats = {
-            "session_id": f"playback_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            "session_id": f"playback_{self.session_timestamp}",
             "start_time": None,
             "end_time": None,
             "pages_processed": 0,
             "pages_successful": 0,
             "pages_failed": 0,
-            "strategies_used": {},
+            "strategies_used": defaultdict(int),
             "errors": [],
-            "page_sequence": []
+            "page_log": f"logs/playback_session_{self.session_timestamp}.jsonl",
+            "page_log_t0": self._t0_wall.isoformat()
         }
 
     def load_strategy_config(self):
         """Load optimized strategy configuration"""
         try:
-            with open(self.strategy_file, 'r', encoding='utf-8') as f:
-                self.strategy_config = json.load(f)
+            if orjson is not None:
+                with open(self.strategy_file, 'rb') as f:
+                    self.strategy_config = orjson.loads(f.read())
+            else:
+                with open(self.strategy_file, 'r', encoding='utf-8') as f:
+                    self.strategy_config = json.load(f)
 
             logger.info(f"Loaded strategy config: {len(self.strategy_config.get('default_strategies', {}))} strategies")
 
@@ -73,6 +150,124 @@ class SmartPlaybackSystem:
             logger.error(f"Failed to load strategy config: {e}")
             raise
 
+        self.rebuild_strategy_index()
+
+    def rebuild_strategy_index(self):
+        """Rebuild precomputed keyword matchers - call after modifying strategy_config in place"""
+        self._build_folded_keywords()
+        self._keyword_automaton = self._build_keyword_automaton()
+        # Resolved strategy per casefolded page title - invalid once config changes
+        self._strategy_cache = {}
+
+        # Derived inclusion strategy only depends on config - build it once
+        barrier_config = self.strategy_config.get('special_cases', {}).get('barrier_free_exception')
+        self._barrier_free_strategy = self.create_barrier_free_strategy(barrier_config) if barrier_config else None
+
+        # Navigation script - clicks at once: navigate_to_next_page and the fill+navigate
+        # injection wait for page readiness before the call, navigation_delay only caps that wait. The marker lets the
+        # post-click wait tell the current document apart from the next one
+        js_navigation = self.strategy_config.get('filling_algorithm', {}).get('navigation_script', '')
+        js_code = js_navigation.replace('{navigation_delay}', '0') if js_navigation else self.DEFAULT_NAVIGATION_SCRIPT
+        self._navigation_js = "window.__navigationPending = true;\n" + js_code
+
+    def _build_folded_keywords(self):
+        """Casefold special-case patterns and enabled strategy keywords once at load"""
+        # Special cases are checked in order - most frequent first ('expected_frequency', default 0)
+        special_cases = self.strategy_config.get('special_cases', {})
+        self._special_dispatch = sorted(
+            (
+                (case_name, tuple(pattern.casefold() for pattern in case_config.get('page_patterns', [])))
+                for case_name, case_config in special_cases.items()
+            ),
+            key=lambda case: special_cases[case[0]].get('expected_frequency', 0),
+            reverse=True
+        )
+
+        # One compiled matcher per enabled strategy. The lookahead alternation (longest keyword
+        # first) reports the longest keyword starting at every title position, overlaps included
+        default_strategies = self.strategy_config.get('default_strategies', {})
+        self._strategy_keywords_folded = []
+        for strategy_name, strategy_config in default_strategies.items():
+            keywords = strategy_config.get('keywords', [])
+            if not strategy_config.get('enabled', True) or not keywords:
+                continue
+
+            originals = {keyword.casefold(): keyword for keyword in keywords}
+            alternation = '|'.join(map(re.escape, sorted(originals, key=len, reverse=True)))
+            self._strategy_keywords_folded.append((strategy_name, re.compile(f'(?=({alternation}))'), originals))
+
+    def _build_keyword_automaton(self):
+        """
+        Compile special-case patterns and strategy keywords into one Aho-Corasick automaton
+
+        Each casefolded keyword maps to a list of (kind, order, name, keyword) entries,
+        so a page title is matched against all keywords in a single pass.
+        Returns None when pyahocorasick is not installed (linear matching is used instead).
+        """
+        if ahocorasick is None:
+            logger.debug("pyahocorasick not installed - using linear keyword matching")
+            return None
+
+        automaton = ahocorasick.Automaton()
+
+        def add_keyword(keyword: str, entry: tuple):
+            key = keyword.casefold()
+            entries = automaton.get(key, [])
+            entries.append(entry)
+            automaton.add_word(key, entries)
+
+        for order, (case_name, patterns) in enumerate(self._special_dispatch):
+            for pattern in patterns:
+                add_keyword(pattern, ('special', order, case_name, pattern))
+
+        default_strategies = self.strategy_config.get('default_strategies', {})
+        for order, (strategy_name, strategy_config) in enumerate(default_strategies.items()):
+            if not strategy_config.get('enabled', True):
+                continue
+            for keyword in strategy_config.get('keywords', []):
+                add_keyword(keyword, ('default', order, strategy_name, keyword))
+
+        if len(automaton) == 0:
+            return None
+
+        automaton.make_automaton()
+        logger.debug(f"Keyword automaton compiled: {len(automaton)} keywords")
+        return automaton
+
+    def _match_keywords_automaton(self, title_folded: str):
+        """Single-pass keyword matching - returns (special case name, {strategy: [keywords]})"""
+        special_match = None
+        keyword_matches = {}
+
+        for _, entries in self._keyword_automaton.iter(title_folded):
+            for kind, order, name, keyword in entries:
+                if kind == 'special':
+                    if special_match is None or order < special_match[0]:
+                        special_match = (order, name)
+                elif keyword not in keyword_matches.setdefault(name, []):
+                    keyword_matches[name].append(keyword)
+
+        # Keep strategy config order so equal scores resolve as in the linear scan
+        default_strategies = self.strategy_config.get('default_strategies', {})
+        keyword_matches = {name: keyword_matches[name] for name in default_strategies if name in keyword_matches}
+
+        return (special_match[1] if special_match else None), keyword_matches
+
+    def _match_keywords_linear(self, title_folded: str):
+        """Keyword matching without automaton - returns (special case name, {strategy: [keywords]})"""
+        for case_name, patterns in self._special_dispatch:
+            if any(pattern in title_folded for pattern in patterns):
+                return case_name, {}
+
+        keyword_matches = {}
+
+        for strategy_name, keyword_re, originals in self._strategy_keywords_folded:
+            matches = list(dict.fromkeys(originals[match] for match in keyword_re.findall(title_folded)))
+            if matches:
+                keyword_matches[strategy_name] = matches
+
+        return None, keyword_matches
+
     def connect_to_browser(self) -> bool:
         """Connect to persistent browser"""
         try:
@@ -85,6 +280,9 @@ class SmartPlaybackSystem:
                 self.status_manager = StatusIndicatorManager(self.driver)
                 logger.debug("Status indicator manager initialized")
 
+                self.install_page_tracker()
+                self.register_strategy_scripts()
+
                 return True
             else:
                 logger.error("Failed to connect to browser")
@@ -94,7 +292,80 @@ class SmartPlaybackSystem:
             logger.error(f"Browser connection error: {e}")
             return False
 
-    def get_page_strategy(self, page_title: str) -> Optional[Dict]:
+    def install_page_tracker(self):
+        """Install window.__pageId tracker on the current page and on every newly loaded document"""
+        try:
+            tracker_js = self.js_loader.load_script('page_id_tracker')
+            response = self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+                'source': f"{tracker_js}\ninstallPageIdTracker();"
+            })
+            self._page_tracker_script_id = response['identifier']
+            self.js_loader.execute_script(self.driver, 'page_id_tracker', 'installPageIdTracker')
+            self._page_tracker_installed = True
+            logger.debug("Page ID tracker installed")
+
+        except Exception as e:
+            self._page_tracker_installed = False
+            logger.debug(f"Page ID tracker not available, using DOM queries: {e}")
+
+    def register_strategy_scripts(self):
+        """Install strategy scripts on every newly loaded document so calls send only the function call"""
+        registered = self.js_loader.register_for_new_documents(self.driver)
+        logger.debug(f"Strategy scripts registered for new documents: {len(registered)}")
+
+    def remove_page_scripts(self):
+        """Remove the page tracker and strategy scripts from new documents - for a WebDriver session that is reused"""
+        if self._page_tracker_script_id is not None:
+            try:
+                self.driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument', {
+                    'identifier': self._page_tracker_script_id
+                })
+            except Exception as e:
+                logger.debug(f"Could not remove page tracker script: {e}")
+            self._page_tracker_script_id = None
+        self.js_loader.unregister_new_documents(self.driver)
+
+    def evaluate_script(self, script_body: str):
+        """
+        Run a script body (may use 'return') via CDP Runtime.evaluate
+
+        Skips Selenium's execute_script wrapping for small value-returning scripts.
+        Falls back to execute_script when CDP is not available.
+        Scripts that need element arguments must keep using execute_script.
+        """
+        if self._cdp_available:
+            try:
+                response = self.driver.execute_cdp_cmd('Runtime.evaluate', {
+                    'expression': f"(function() {{\n{script_body}\n}})()",
+                    'returnByValue': True,
+                    'awaitPromise': True
+                })
+            except WebDriverException as e:
+                logger.debug(f"CDP Runtime.evaluate unavailable, using execute_script: {e}")
+                self._cdp_available = False
+            else:
+                if 'exceptionDetails' in response:
+                    raise JavascriptException(response['exceptionDetails'].get('text', 'JavaScript error'))
+                return response.get('result', {}).get('value')
+
+        return self.driver.execute_script(script_body)
+
+    def get_current_page_id(self, previous_page_id: Optional[str] = None) -> str:
+        """Get current page ID from the in-page tracker, falling back to PageIdentifier
+
+        previous_page_id keeps a text-less page from reusing the previous page's title as its ID.
+        """
+        if self._page_tracker_installed:
+            try:
+                page_id = self.driver.execute_script("return window.__pageId || null;")
+                if page_id:
+                    return page_id
+            except Exception as e:
+                logger.debug(f"Page ID tracker read failed: {e}")
+
+        return self.page_identifier.get_page_id(self.driver, previous_page_id)
+
+    def get_page_strategy(self, page_title: str, title_folded: str = None) -> Optional[Dict]:
         """
         Get filling strategy for current page
 
@@ -104,48 +375,53 @@ class SmartPlaybackSystem:
         3. Fuzzy matching fallback
         """
 
-        # Check special cases first
-        special_cases = self.strategy_config.get('special_cases', {})
+        # Callers that already casefolded the title pass it in to avoid doing it twice
+        if title_folded is None:
+            title_folded = page_title.casefold()
+
+        # Strategy only depends on the title and config - revisited pages skip matching
+        if title_folded in self._strategy_cache:
+            logger.debug("Using cached strategy for page")
+            return self._strategy_cache[title_folded]
+
+        strategy = self._resolve_page_strategy(page_title, title_folded)
+        self._strategy_cache[title_folded] = strategy
+        return strategy
 
-        for case_name, case_config in special_cases.items():
-            page_patterns = case_config.get('page_patterns', [])
+    def _resolve_page_strategy(self, page_title: str, title_folded: str) -> Optional[Dict]:
+        """Match the casefolded title against special cases, default strategies and fuzzy fallback"""
+        if self._keyword_automaton is not None:
+            special_case, keyword_matches = self._match_keywords_automaton(title_folded)
+        else:
+            special_case, keyword_matches = self._match_keywords_linear(title_folded)
 
-            # Check if current page matches any pattern
-            for pattern in page_patterns:
-                if pattern.lower() in page_title.lower():
-                    logger.info(f"Matched special case: {case_name}")
+        # Check special cases first
+        if special_case:
+            logger.info(f"Matched special case: {special_case}")
+            case_config = self.strategy_config['special_cases'][special_case]
 
-                    # Handle inclusion pages specially
-                    if case_name == 'barrier_free_exception':
-                        return self.create_barrier_free_strategy(case_config)
+            # Handle inclusion pages specially
+            if special_case == 'barrier_free_exception':
+                return self._barrier_free_strategy
 
-                    return case_config.get('strategy', {})
+            return case_config.get('strategy', {})
 
         # Check default strategies with fuzzy matching
         default_strategies = self.strategy_config.get('default_strategies', {})
 
-        # Try keyword matching first - with priority system
+        # Keyword matches - with priority system
         matched_strategies = []
 
-        for strategy_name, strategy_config in default_strategies.items():
-            # Skip disabled strategies
-            if not strategy_config.get('enabled', True):
-                continue
-
-            keywords = strategy_config.get('keywords', [])
+        for strategy_name, matches in keyword_matches.items():
+            strategy_config = default_strategies[strategy_name]
             priority = strategy_config.get('priority', 0)
 
-            if keywords:
-                # Check for keyword matches
-                keyword_matches = [keyword for keyword in keywords if keyword.lower() in page_title.lower()]
+            # Calculate match score based on longest matching keyword + priority
+            longest_match = max(matches, key=len)
+            match_score = len(longest_match) + priority
 
-                if keyword_matches:
-                    # Calculate match score based on longest matching keyword + priority
-                    longest_match = max(keyword_matches, key=len)
-                    match_score = len(longest_match) + priority
-
-                    logger.debug(f"Strategy {strategy_name}: matches={keyword_matches}, score={match_score}, priority={priority}")
-                    matched_strategies.append((match_score, strategy_name, strategy_config))
+            logger.debug(f"Strategy {strategy_name}: matches={matches}, score={match_score}, priority={priority}")
+            matched_strategies.append((match_score, strategy_name, strategy_config))
 
         # Sort by match score (highest first)
         if matched_strategies:
@@ -181,44 +457,45 @@ class SmartPlaybackSystem:
 
         try:
             # Track strategy usage
-            if strategy_pattern not in self.session_stats['strategies_used']:
-                self.session_stats['strategies_used'][strategy_pattern] = 0
             self.session_stats['strategies_used'][strategy_pattern] += 1
 
             # Execute based on pattern type
-            if strategy_pattern == 'INCLUSION_MIXED_STRATEGY':
-                return self.execute_inclusion_strategy(strategy)
-
-            elif strategy_pattern == 'MATRIX_RATING':
-                return self.execute_matrix_strategy(strategy)
-
-            elif strategy_pattern == 'MATRIX_RANDOM_RATING':
-                return self.execute_matrix_random_strategy(strategy)
-
-            elif strategy_pattern == 'RADIO_CHOICE':
-                return self.execute_radio_strategy(strategy)
-
-            elif strategy_pattern == 'INPUT_FIELD':
-                return self.execute_input_strategy(strategy)
-
-            elif strategy_pattern == 'CHECKBOX_MULTI':
-                return self.execute_checkbox_strategy(strategy)
-
-            elif strategy_pattern == 'SKIP':
-                return self.execute_skip_strategy(strategy)
-
-            elif strategy_pattern == 'FINAL_PAGE':
-                return self.execute_final_page_strategy(strategy)
-
-            else:
+            executor = self._strategy_dispatch.get(strategy_pattern)
+            if executor is None:
                 logger.warning(f"Unknown strategy pattern: {strategy_pattern}")
                 return False
 
+            return executor(strategy)
+
         except Exception as e:
             logger.error(f"Strategy execution error: {e}")
             self.session_stats['errors'].append(f"Strategy {strategy_pattern}: {str(e)}")
             return False
 
+    def _execute_strategy_script(self, strategy: Dict, script_name: str, function_name: str, *args):
+        """
+        Execute strategy JavaScript and return its result
+
+        For auto-navigating strategies the configured navigation script runs in the
+        same injection when the fill succeeds, saving a separate round-trip. As in
+        navigate_to_next_page, navigation_delay only caps the page-ready wait.
+        """
+        if not strategy.get('auto_navigate', True):
+            return self.js_loader.execute_script(self.driver, script_name, function_name, *args)
+
+        navigation_delay = strategy.get('navigation_delay', 3000) / 1000  # Convert to seconds
+        logger.info(f"Filling page and auto-navigating (waiting up to {navigation_delay} seconds for page ready)...")
+        self.wait_for_page_ready(navigation_delay)
+
+        response = self.js_loader.execute_script_with_navigation(
+            self.driver, script_name, function_name, self._navigation_js, *args
+        )
+        if not response:
+            return None
+
+        self._navigated_in_script = bool(response.get('navigated'))
+        return response.get('result')
+
     def execute_inclusion_strategy(self, strategy: Dict) -> bool:
         """Execute specialized inclusion page strategy using external JavaScript"""
         logger.info("Executing inclusion mixed strategy (barrier-free A1, others A6)")
@@ -230,8 +507,8 @@ class SmartPlaybackSystem:
                 return False
 
             # Execute external JavaScript function
-            result = self.js_loader.execute_script(
-                self.driver,
+            result = self._execute_strategy_script(
+                strategy,
                 'barrier_free_inclusion',
                 'executeBarrierFreeInclusion',
                 barrier_keywords
@@ -255,8 +532,8 @@ class SmartPlaybackSystem:
 
         try:
             # Execute external JavaScript function
-            result = self.js_loader.execute_script(
-                self.driver,
+            result = self._execute_strategy_script(
+                strategy,
                 'matrix_strategy',
                 'executeMatrixStrategy',
                 rating_level
@@ -289,8 +566,8 @@ class SmartPlaybackSystem:
 
         try:
             # Execute external JavaScript function
-            result = self.js_loader.execute_script(
-                self.driver,
+            result = self._execute_strategy_script(
+                strategy,
                 'matrix_random_strategy',
                 'executeMatrixRandomStrategy',
                 rating_options
@@ -319,8 +596,8 @@ class SmartPlaybackSystem:
 
         try:
             # Execute external JavaScript function
-            result = self.js_loader.execute_script(
-                self.driver,
+            result = self._execute_strategy_script(
+                strategy,
                 'radio_strategy',
                 'executeRadioStrategy',
                 selected_answer
@@ -352,8 +629,8 @@ class SmartPlaybackSystem:
 
         try:
             # Execute external JavaScript function
-            result = self.js_loader.execute_script(
-                self.driver,
+            result = self._execute_strategy_script(
+                strategy,
                 'input_strategy',
                 'executeInputStrategy',
                 input_value
@@ -377,8 +654,8 @@ class SmartPlaybackSystem:
 
         try:
             # Execute external JavaScript function
-            result = self.js_loader.execute_script(
-                self.driver,
+            result = self._execute_strategy_script(
+                strategy,
                 'checkbox_strategy',
                 'executeCheckboxStrategy',
                 selected_indices
@@ -412,62 +689,43 @@ class SmartPlaybackSystem:
         logger.info("Reached final page - clicking final submit button")
 
         try:
-            # Try different final submit button selectors
-            final_submit_selectors = [
-                "#ls-button-submit",  # Primary selector for final submit
-                "button[value='movesubmit'][name='move']",  # Specific final submit button
-                "button:contains('Odeslat')",  # Button with "Odeslat" text
-                "input[type='submit'][value*='Odeslat']",
-                "button[type='submit']"
-            ]
-
-            for selector in final_submit_selectors:
-                try:
-                    button = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    logger.debug(f"Found button with selector {selector}: enabled={button.is_enabled()}, displayed={button.is_displayed()}")
-
-                    if button:
-                        if not button.is_enabled():
-                            logger.warning(f"Button found but disabled: {selector}")
-                            continue
-                        if not button.is_displayed():
-                            logger.warning(f"Button found but not displayed: {selector}")
-                            continue
-
-                        logger.info(f"Clicking final submit button: {selector}")
-                        # Try JavaScript click if regular click fails
-                        try:
-                            button.click()
-                        except:
-                            logger.warning("Regular click failed, trying JavaScript click")
-                            self.driver.execute_script("arguments[0].click();", button)
-
-                        logger.success("🎉 FINAL SUBMIT CLICKED - Waiting for completion page...")
-                        time.sleep(Config.NAVIGATION_DELAY + 2)  # Wait for final submission and redirect
-
-                        # Verify completion page
-                        try:
-                            completion_div = self.driver.find_element(By.CSS_SELECTOR, "div.completed-wrapper")
-                            completion_text = self.driver.find_element(By.CSS_SELECTOR, "div.completed-text").text
-                            logger.success("✅ SURVEY COMPLETED - Completion page confirmed!")
-                            logger.info(f"Completion message: {completion_text[:100]}")
-                        except Exception as e:
-                            logger.debug(f"Completion page divs not found: {e}")
-                            # Check page source for completion text
-                            page_source = self.driver.page_source
-                            if "Vaše odpovědi byly v pořádku uloženy" in page_source:
-                                logger.success("✅ SURVEY COMPLETED - Completion text found!")
-                            elif "děkujeme" in page_source.lower() or "completed" in page_source.lower():
-                                logger.success("✅ SURVEY COMPLETED - Generic completion indicators found!")
-                            else:
-                                logger.warning("Could not verify completion page, but final submit was clicked")
-
-                        return True
-                except Exception as e:
-                    logger.debug(f"Selector {selector} failed: {e}")
-                    continue
-
-            logger.warning("No final submit button found - survey may already be completed")
+            # Probe selectors and click the first live button in a single round-trip
+            final_submit_js = self.js_loader.load_script('final_submit')
+            result = self.evaluate_script(f"{final_submit_js}\nreturn executeFinalSubmit();")
+
+            if not result or not result.get('success'):
+                logger.warning("No final submit button found - survey may already be completed")
+                return True
+
+            logger.info(f"Clicked final submit button: {result.get('selector')}")
+            logger.success("🎉 FINAL SUBMIT CLICKED - Waiting for completion page...")
+            # Wait for final submission and redirect - returns as soon as the completion page is shown
+            try:
+                WebDriverWait(self.driver, Config.NAVIGATION_DELAY + 2, poll_frequency=0.2,
+                              ignored_exceptions=(WebDriverException,)).until(
+                    lambda driver: 'completed' in driver.current_url.lower() or
+                    driver.find_elements(By.CSS_SELECTOR, "div.completed-wrapper")
+                )
+            except TimeoutException:
+                logger.debug("Completion page not detected within the wait - checking page text")
+
+            # Verify completion page
+            try:
+                completion_div = self.driver.find_element(By.CSS_SELECTOR, "div.completed-wrapper")
+                completion_text = self.driver.find_element(By.CSS_SELECTOR, "div.completed-text").text
+                logger.success("✅ SURVEY COMPLETED - Completion page confirmed!")
+                logger.info(f"Completion message: {completion_text[:100]}")
+            except Exception as e:
+                logger.debug(f"Completion page divs not found: {e}")
+                # Check page text for completion text (in-page, without transferring the page source)
+                completion = self.evaluate_script(self.COMPLETION_TEXT_SCRIPT)
+                if completion == 'saved':
+                    logger.success("✅ SURVEY COMPLETED - Completion text found!")
+                elif completion == 'generic':
+                    logger.success("✅ SURVEY COMPLETED - Generic completion indicators found!")
+                else:
+                    logger.warning("Could not verify completion page, but final submit was clicked")
+
             return True
 
         except Exception as e:
@@ -484,39 +742,15 @@ class SmartPlaybackSystem:
         navigation_delay = strategy.get('navigation_delay', 3000) / 1000  # Convert to seconds
 
         try:
-            logger.info(f"Auto-navigating in {navigation_delay} seconds...")
-            time.sleep(navigation_delay)
+            # Navigate as soon as the page is ready, navigation_delay is only the upper bound
+            logger.info(f"Auto-navigating (waiting up to {navigation_delay} seconds for page ready)...")
+            self.wait_for_page_ready(navigation_delay)
 
-            # JavaScript navigation
-            js_navigation = self.strategy_config.get('filling_algorithm', {}).get('navigation_script', '')
-
-            if js_navigation:
-                js_code = js_navigation.replace('{navigation_delay}', '0')  # We already waited
-            else:
-                # Fallback navigation
-                js_code = """
-                var nextButton = document.querySelector('#ls-button-submit');
-                if (nextButton) {
-                    nextButton.click();
-                    return {success: true, button: 'found'};
-                } else {
-                    return {success: false, button: 'not_found'};
-                }
-                """
-
-            result = self.driver.execute_script(js_code)
+            result = self.evaluate_script(self._navigation_js)
 
             if result and result.get('success'):
                 logger.success("Navigation successful")
-
-                # Navigation successful - status will be updated when processing new page
-
-                time.sleep(Config.NAVIGATION_DELAY - 1)  # Wait for page load
-
-                # Update status to show we're ready to process the new page
-                if self.status_manager:
-                    self.status_manager.processing_page(current_page, 'Načítám novou stránku')
-
+                self.wait_for_next_page()
                 return True
             else:
                 logger.warning("Navigation may have failed")
@@ -526,13 +760,34 @@ class SmartPlaybackSystem:
             logger.error(f"Navigation failed: {e}")
             return False
 
-    def process_current_page(self) -> bool:
-        """Process current page with appropriate strategy"""
+    def wait_for_page_ready(self, timeout: float) -> bool:
+        """Wait until the page is loaded and has a Next button (timeout is the upper bound)"""
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.2,
+                          ignored_exceptions=(WebDriverException,)).until(
+                lambda driver: driver.execute_script(self.PAGE_READY_SCRIPT)
+            )
+            return True
+        except TimeoutException:
+            logger.debug(f"Page not ready after {timeout}s - continuing")
+            return False
+
+    def wait_for_next_page(self):
+        """Wait for the next page to load after the Next button was clicked"""
+        self.wait_for_page_ready(Config.NAVIGATION_DELAY)
+
+        # Update status to show we're ready to process the new page
+        if self.status_manager:
+            self.status_manager.processing_page(self.session_stats['pages_processed'] + 1, 'Načítám novou stránku')
+
+    def process_current_page(self, page_id: str = None, page_id_folded: str = None) -> bool:
+        """Process current page with appropriate strategy (page_id avoids a second lookup)"""
 
         try:
             # Get page information
             current_url = self.driver.current_url
-            page_id = self.page_identifier.get_page_id(self.driver)
+            if page_id is None:
+                page_id = self.get_current_page_id()
 
             logger.info(f"Processing page: {page_id[:50]}...")
 
@@ -541,13 +796,13 @@ class SmartPlaybackSystem:
                 "page_number": self.session_stats['pages_processed'] + 1,
                 "page_id": page_id,
                 "url": current_url,
-                "timestamp": datetime.now().isoformat()
+                "t_ns": time.monotonic_ns() - self._t0_mono
             }
 
             self.session_stats['pages_processed'] += 1
 
             # Get strategy for this page
-            strategy = self.get_page_strategy(page_id)
+            strategy = self.get_page_strategy(page_id, page_id_folded)
 
             if not strategy:
                 logger.error(f"No strategy found for page")
@@ -559,12 +814,13 @@ class SmartPlaybackSystem:
                 page_info['status'] = 'failed'
                 page_info['error'] = 'No strategy found'
                 self.session_stats['pages_failed'] += 1
-                self.session_stats['page_sequence'].append(page_info)
+                self.log_page(page_info)
                 return False
 
             page_info['strategy'] = strategy.get('pattern', 'UNKNOWN')
 
-            # Execute strategy
+            # Execute strategy (may also click Next in the same injection)
+            self._navigated_in_script = False
             success = self.execute_page_strategy(strategy)
 
             if success:
@@ -572,8 +828,12 @@ class SmartPlaybackSystem:
                 page_info['status'] = 'success'
                 self.session_stats['pages_successful'] += 1
 
-                # Navigate to next page
-                if self.navigate_to_next_page(strategy):
+                # Navigate to next page unless the strategy script already did
+                if self._navigated_in_script:
+                    logger.success("Navigation successful")
+                    self.wait_for_next_page()
+                    page_info['navigation'] = 'success'
+                elif self.navigate_to_next_page(strategy):
                     page_info['navigation'] = 'success'
                 else:
                     page_info['navigation'] = 'failed'
@@ -583,7 +843,7 @@ class SmartPlaybackSystem:
                 page_info['status'] = 'failed'
                 self.session_stats['pages_failed'] += 1
 
-            self.session_stats['page_sequence'].append(page_info)
+            self.log_page(page_info)
             return success
 
         except Exception as e:
@@ -591,6 +851,17 @@ class SmartPlaybackSystem:
             self.session_stats['errors'].append(f"Page processing: {str(e)}")
             return False
 
+    def log_page(self, page_info: Dict):
+        """Append page record to the session JSON lines log (constant memory, survives interruption)"""
+        try:
+            os.makedirs("logs", exist_ok=True)
+
+            with open(self.session_stats['page_log'], 'a', encoding='utf-8') as f:
+                f.write(json.dumps(page_info, ensure_ascii=False) + '\n')
+
+        except Exception as e:
+            logger.error(f"Failed to write page log: {e}")
+
     def create_barrier_free_strategy(self, barrier_config: Dict) -> Dict:
         """Create barrier-free exception strategy for inclusion pages"""
         # Get barrier-free keywords from config
@@ -606,7 +877,7 @@ class SmartPlaybackSystem:
 
         return {
             'pattern': 'INCLUSION_MIXED_STRATEGY',
-            'barrier_keywords': barrier_keywords,
+            'barrier_keywords': tuple(barrier_keywords),
             'auto_navigate': True,
             'navigation_delay': 4000,
             'description': 'Mixed inclusion strategy: A1 for barrier-free, A6 for others'
@@ -622,7 +893,8 @@ class SmartPlaybackSystem:
         logger.info("🚀 STARTING COMPLETE SURVEY AUTOMATION")
         self.session_stats['start_time'] = datetime.now().isoformat()
 
-        if not self.connect_to_browser():
+        # Reuse a connection made up front (e.g. while waiting for the user to start)
+        if self.driver is None and not self.connect_to_browser():
             return self.session_stats
 
         try:
@@ -642,7 +914,7 @@ class SmartPlaybackSystem:
                 logger.info(f"\n--- PAGE {page_count} ---")
 
                 # Get current page ID for loop detection
-                current_page_id = self.page_identifier.get_page_id(self.driver)
+                current_page_id = self.get_current_page_id(last_page_id)
 
                 # Anti-loop protection: Check if we're stuck on the same page
                 if current_page_id == last_page_id:
@@ -664,19 +936,18 @@ class SmartPlaybackSystem:
                     self.status_manager.processing_page(page_count, 'Zpracovávám otázky')
 
                 # Process current page
-                success = self.process_current_page()
+                current_page_id_folded = current_page_id.casefold()
+                success = self.process_current_page(current_page_id, current_page_id_folded)
 
                 # Check if we've reached the final page
-                if any(indicator in current_page_id.lower() for indicator in ['dostali jste se na konec', 'dokončení', 'odeslat']):
+                if self._FINAL_PAGE_RE.search(current_page_id_folded):
                     logger.success("🎉 Reached final page - survey completed!")
                     if self.status_manager:
                         self.status_manager.automation_completed()
                     break
 
-                # Delay between pages - status will be updated when processing starts
-
-                # Small delay between pages
-                time.sleep(Config.FORM_FILL_DELAY)
+                # Make sure the next page is ready - FORM_FILL_DELAY caps the wait
+                self.wait_for_page_ready(Config.FORM_FILL_DELAY)
 
         except KeyboardInterrupt:
             logger.warning("Survey automation interrupted by user")
@@ -697,15 +968,18 @@ class SmartPlaybackSystem:
         return self.session_stats
 
     def save_session_stats(self):
-        """Save session statistics to file"""
+        """Save session summary to file (page records are already in page_log)"""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"logs/playback_session_{timestamp}.json"
+            filename = f"logs/playback_session_{self.session_timestamp}.json"
 
             os.makedirs("logs", exist_ok=True)
 
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(self.session_stats, f, ensure_ascii=False, indent=2)
+            if orjson is not None:
+                with open(filename, 'wb') as f:
+                    f.write(orjson.dumps(self.session_stats, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                with open(filename, 'w', encoding='utf-8') as f:
+                    json.dump(self.session_stats, f, ensure_ascii=False, indent=2)
 
             logger.success(f"Session stats saved: {filename}")
 
@@ -743,6 +1017,12 @@ class SmartPlaybackSystem:
 
 # Main execution
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Smart Playback System')
+    parser.add_argument('--yes', action='store_true', help='Start automation without waiting for ENTER')
+    args = parser.parse_args()
+
     playback = SmartPlaybackSystem()
 
     print("🎯 SMART PLAYBACK SYSTEM")
@@ -751,7 +1031,14 @@ if __name__ == "__main__":
     print("Make sure you're on the first page of the survey.")
     print()
 
-    input("Press ENTER to start automation...")
+    if args.yes:
+        playback.connect_to_browser()
+    else:
+        # Connect to the browser and install page helpers while the user gets ready
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            connecting = executor.submit(playback.connect_to_browser)
+            input("Press ENTER to start automation...")
+            connecting.result()
 
     # Run complete survey
     results = playback.run_complete_survey()
@@ -5,8 +5,11 @@ Handles loading and execution of external JavaScript files
 """
 
 import os
+import re
+import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from loguru import logger
 
 # Import config from parent directory
@@ -17,6 +20,24 @@ from config import Config
 class JavaScriptLoader:
     """Utility class for loading and managing external JavaScript files"""
 
+    # Scripts used by the playback system
+    EXPECTED_SCRIPTS = [
+        'barrier_free_inclusion',
+        'matrix_strategy',
+        'matrix_random_strategy',
+        'input_strategy',
+        'radio_strategy',
+        'checkbox_strategy',
+        'final_submit',
+        'page_id_tracker'
+    ]
+
+    # Returned by a registered-script call when the current document predates the registration
+    MISSING = '__MISSING__'
+
+    # Top-level function declarations, exported into the in-page registry
+    _FUNCTION_RE = re.compile(r'^function\s+(\w+)', re.MULTILINE)
+
     def __init__(self, js_scripts_dir: str = None):
         """Initialize JavaScript loader with scripts directory"""
         if js_scripts_dir is None:
@@ -26,6 +47,14 @@ class JavaScriptLoader:
 
         # Use caching based on config
         self._script_cache = {} if Config.JS_CACHE_ENABLED else None
+        # Script body (or registry lookup) + "return fn(" prefix per (script_name, function_name, registered)
+        self._prefix_cache: Dict[Tuple[str, str, bool], str] = {}
+        # (mtime_ns, code) per script when caching is disabled - unchanged files are not re-read
+        self._mtime_cache: Dict[str, Tuple[int, str]] = {}
+        # Scripts installed on every new document via register_for_new_documents
+        self._registered = set()
+        # CDP identifiers of those registrations, for unregister_new_documents
+        self._new_document_ids: List[str] = []
         logger.debug(f"JavaScript loader initialized with directory: {self.js_scripts_dir}")
         logger.debug(f"Caching {'enabled' if Config.JS_CACHE_ENABLED else 'disabled'}")
 
@@ -34,19 +63,28 @@ class JavaScriptLoader:
         script_path = self.js_scripts_dir / f"{script_name}.js"
 
         # Check cache first
-        if script_name in self._script_cache:
+        if self._script_cache is not None and script_name in self._script_cache:
             logger.debug(f"Using cached JavaScript: {script_name}")
             return self._script_cache[script_name]
 
         try:
-            if not script_path.exists():
+            try:
+                mtime = None
+                if self._script_cache is None:
+                    # Caching disabled so edits apply - still skip the read when the file is unchanged
+                    mtime = script_path.stat().st_mtime_ns
+                    cached = self._mtime_cache.get(script_name)
+                    if cached is not None and cached[0] == mtime:
+                        return cached[1]
+                js_code = script_path.read_text(encoding='utf-8')
+            except FileNotFoundError:
                 raise FileNotFoundError(f"JavaScript file not found: {script_path}")
 
-            with open(script_path, 'r', encoding='utf-8') as f:
-                js_code = f.read()
-
             # Cache the loaded script
-            self._script_cache[script_name] = js_code
+            if self._script_cache is not None:
+                self._script_cache[script_name] = js_code
+            else:
+                self._mtime_cache[script_name] = (mtime, js_code)
             logger.debug(f"Loaded JavaScript file: {script_path}")
 
             return js_code
@@ -55,34 +93,92 @@ class JavaScriptLoader:
             logger.error(f"Failed to load JavaScript {script_name}: {e}")
             raise
 
+    def _format_args(self, args) -> str:
+        """Serialize Python arguments into a JavaScript argument list"""
+        # Czech strings stay readable in the generated JS instead of \uXXXX escapes
+        return ','.join([json.dumps(arg, ensure_ascii=False) for arg in args])
+
+    def _call_parts(self, script_name: str, function_name: str, registered: bool) -> Tuple[str, str]:
+        """Return (preamble, callee): the full script body, or a registry lookup for registered scripts"""
+        if not registered:
+            return self.load_script(script_name), function_name
+
+        preamble = (f"var script = window.__evaluaceScripts && window.__evaluaceScripts[{json.dumps(script_name)}];\n"
+                    f"if (!script) {{ return '{self.MISSING}'; }}")
+        return preamble, f"script.{function_name}"
+
+    def _call_prefix(self, script_name: str, function_name: str, registered: bool = False) -> str:
+        """Return script body (or registry lookup) followed by the opening of the function call"""
+        key = (script_name, function_name, registered)
+        prefix = self._prefix_cache.get(key)
+        if prefix is None:
+            preamble, callee = self._call_parts(script_name, function_name, registered)
+            prefix = f"{preamble}\nreturn {callee}("
+            # Only keep prefixes around when script caching is enabled
+            if self._script_cache is not None:
+                self._prefix_cache[key] = prefix
+        return prefix
+
+    def register_for_new_documents(self, driver, script_names: list = None) -> list:
+        """
+        Install scripts on every newly loaded document (CDP Page.addScriptToEvaluateOnNewDocument)
+
+        Later calls to registered scripts send only the function call instead of the
+        whole script body. Skipped when caching is disabled so edited scripts still apply.
+        Returns names of scripts that were registered.
+        """
+        if self._script_cache is None:
+            logger.debug("JavaScript caching disabled - skipping new-document registration")
+            return []
+
+        registered = []
+        for script_name in script_names or self.EXPECTED_SCRIPTS:
+            if script_name in self._registered:
+                continue
+            try:
+                js_code = self.load_script(script_name)
+                exports = ', '.join(f"{name}: {name}" for name in self._FUNCTION_RE.findall(js_code))
+                source = (f"(function() {{\n{js_code}\n"
+                          f"var registry = window.__evaluaceScripts = window.__evaluaceScripts || {{}};\n"
+                          f"registry[{json.dumps(script_name)}] = {{{exports}}};\n}})();")
+                response = driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': source})
+                self._new_document_ids.append(response['identifier'])
+            except Exception as e:
+                # Unregistered scripts keep being sent in full
+                logger.debug(f"Could not register {script_name} for new documents: {e}")
+                continue
+
+            self._registered.add(script_name)
+            registered.append(script_name)
+
+        logger.debug(f"Registered scripts for new documents: {registered}")
+        return registered
+
+    def unregister_new_documents(self, driver):
+        """Remove scripts installed by register_for_new_documents - needed when the WebDriver session is reused"""
+        for identifier in self._new_document_ids:
+            try:
+                driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument', {'identifier': identifier})
+            except Exception as e:
+                logger.debug(f"Could not remove new-document script {identifier}: {e}")
+        self._new_document_ids.clear()
+        self._registered.clear()
+
     def execute_script(self, driver, script_name: str, function_name: str, *args) -> Any:
         """Load and execute JavaScript function with parameters"""
         try:
-            # Load the script
-            js_code = self.load_script(script_name)
-
-            # Prepare function call
-            args_js = []
-            for arg in args:
-                if isinstance(arg, str):
-                    args_js.append(f'"{arg}"')
-                elif isinstance(arg, list):
-                    args_js.append(str(arg).replace("'", '"'))
-                else:
-                    args_js.append(str(arg))
-
-            args_str = ', '.join(args_js)
-
-            # Combine script with function call
-            full_js = f"""
-            {js_code}
-
-            return {function_name}({args_str});
-            """
+            args_str = self._format_args(args)
+            registered = script_name in self._registered
+            full_js = ''.join([self._call_prefix(script_name, function_name, registered), args_str, ");"])
 
             logger.debug(f"Executing {function_name} from {script_name}")
             result = driver.execute_script(full_js)
 
+            if registered and result == self.MISSING:
+                # Document loaded before registration - send the whole script
+                full_js = ''.join([self._call_prefix(script_name, function_name), args_str, ");"])
+                result = driver.execute_script(full_js)
+
             logger.debug(f"JavaScript execution result: {result}")
             return result
 
@@ -90,37 +186,97 @@ class JavaScriptLoader:
             logger.error(f"Failed to execute {function_name} from {script_name}: {e}")
             raise
 
+    def _navigation_js(self, script_name: str, function_name: str, registered: bool, args_str: str,
+                       navigation_js: str) -> str:
+        """Build the fill-then-navigate script"""
+        preamble, callee = self._call_parts(script_name, function_name, registered)
+
+        return f"""
+            {preamble}
+
+            var result = {callee}({args_str});
+            if (!result || !result.success) {{
+                return {{result: result, navigated: false}};
+            }}
+
+            var nextButton = document.querySelector('#ls-button-submit');
+            if (nextButton) {{
+                (function() {{
+                    {navigation_js}
+                }})();
+            }}
+            return {{result: result, navigated: !!nextButton}};
+            """
+
+    def execute_script_with_navigation(self, driver, script_name: str, function_name: str,
+                                       navigation_js: str, *args) -> Any:
+        """
+        Execute strategy function and navigate in the same injection
+
+        navigation_js (the caller's navigation script) runs right after the fill,
+        only when the strategy result reports success and the page has a Next
+        button. Returns {result: <strategy result>, navigated: bool}.
+        """
+        try:
+            args_str = self._format_args(args)
+            registered = script_name in self._registered
+
+            logger.debug(f"Executing {function_name} from {script_name} with navigation")
+            response = driver.execute_script(self._navigation_js(script_name, function_name, registered, args_str, navigation_js))
+
+            if registered and response == self.MISSING:
+                # Document loaded before registration - send the whole script
+                response = driver.execute_script(self._navigation_js(script_name, function_name, False, args_str, navigation_js))
+
+            logger.debug(f"JavaScript execution result: {response}")
+            return response
+
+        except Exception as e:
+            logger.error(f"Failed to execute {function_name} from {script_name}: {e}")
+            raise
+
+    def preload_scripts(self, script_names: list = None):
+        """Read scripts into the cache up front so page processing does no disk I/O"""
+        if self._script_cache is None:
+            logger.debug("JavaScript caching disabled - skipping preload")
+            return
+
+        def preload(script_name):
+            try:
+                self.load_script(script_name)
+            except Exception:
+                # load_script already logged the failure - keep preloading the rest
+                pass
+
+        # File reads release the GIL, so the scripts load in parallel
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(preload, script_names or self.EXPECTED_SCRIPTS))
+
     def clear_cache(self):
         """Clear the script cache"""
-        self._script_cache.clear()
+        if self._script_cache is not None:
+            self._script_cache.clear()
+        self._mtime_cache.clear()
+        self._prefix_cache.clear()
         logger.debug("JavaScript cache cleared")
 
+    def _script_stems(self) -> set:
+        """Names of all .js files in the scripts directory, from a single directory listing"""
+        try:
+            with os.scandir(self.js_scripts_dir) as entries:
+                return {entry.name[:-3] for entry in entries if entry.name.endswith('.js') and entry.is_file()}
+        except FileNotFoundError:
+            return set()
+
     def list_available_scripts(self) -> list:
         """List all available JavaScript files"""
         try:
-            js_files = []
-            if self.js_scripts_dir.exists():
-                for file_path in self.js_scripts_dir.glob('*.js'):
-                    js_files.append(file_path.stem)
-            return sorted(js_files)
+            return sorted(self._script_stems())
         except Exception as e:
             logger.error(f"Failed to list JavaScript files: {e}")
             return []
 
     def validate_scripts(self) -> Dict[str, bool]:
         """Validate that all expected JavaScript files exist"""
-        expected_scripts = [
-            'barrier_free_inclusion',
-            'matrix_strategy',
-            'matrix_random_strategy',
-            'input_strategy',
-            'radio_strategy',
-            'checkbox_strategy'
-        ]
-
-        validation_results = {}
-        for script_name in expected_scripts:
-            script_path = self.js_scripts_dir / f"{script_name}.js"
-            validation_results[script_name] = script_path.exists()
-
-        return validation_results
\ No newline at end of file
+        existing = self._script_stems()
+        return {script_name: script_name in existing for script_name in self.EXPECTED_SCRIPTS}
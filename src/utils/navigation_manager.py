@@ -3,12 +3,13 @@ Navigation Manager for Evaluace Filler
 Handles navigation through dotazník pages with robust button detection and page history.
 """
 
+import re
 import time
-from typing import Optional, List, Dict, Any
+from collections import deque
+from typing import Optional, Dict, Any, Deque
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
 from loguru import logger
 
 from .page_identifier import PageIdentifier
@@ -26,33 +27,124 @@ class NavigationManager:
     """
 
     # Standard selectors for navigation buttons
-    NEXT_BUTTON_SELECTORS = [
+    NEXT_BUTTON_SELECTORS = (
         "#ls-button-submit",
         ".ls-move-next-btn",
         "button[value='movenext']",
         "button[name='move'][value='movenext']",
         "input[type='submit'][value='movenext']",
         ".ls-move-submit-btn"
-    ]
+    )
 
-    PREV_BUTTON_SELECTORS = [
+    PREV_BUTTON_SELECTORS = (
         "#ls-button-previous",
         ".ls-move-previous-btn",
         "button[value='moveprev']",
         "button[name='move'][value='moveprev']",
         "input[type='submit'][value='moveprev']"
-    ]
+    )
+
+    # Other buttons that may act as navigation
+    OTHER_NAV_SELECTORS = (
+        'input[type="submit"]',
+        'button[type="submit"]',
+        '.btn-primary',
+        '.btn-success',
+        '.continue-btn',
+        '.submit-btn'
+    )
+
+    # Collects every navigation element in one DOM walk; each element is reported once,
+    # under the first group/selector that matched it.
+    # arguments[0]/[1]/[2] are the next/prev/other selector lists.
+    _NAV_WALK_JS = """
+        var seen = new Set();
+        function collect(selectors) {
+            var found = [];
+            selectors.forEach(function(selector) {
+                document.querySelectorAll(selector).forEach(function(el) {
+                    if (seen.has(el)) return;
+                    seen.add(el);
+                    found.push({
+                        element: el,
+                        selector: selector,
+                        text: (el.innerText || el.textContent || '').trim(),
+                        enabled: !el.disabled,
+                        displayed: el.offsetParent !== null
+                    });
+                });
+            });
+            return found;
+        }
+        return {
+            next_buttons: collect(arguments[0]),
+            prev_buttons: collect(arguments[1]),
+            other_nav_elements: collect(arguments[2])
+        };
+    """
+
+    # Next-button texts that mark the last page
+    FINAL_BUTTON_INDICATORS = ('dokončit', 'dokonč', 'dokon', 'odeslat', 'finish', 'submit', 'complete')
+    _FINAL_BUTTON_RE = re.compile("|".join(map(re.escape, FINAL_BUTTON_INDICATORS)), re.IGNORECASE)
+
+    # Single selector matching any navigation button
+    _COMBINED_NAV_SELECTOR = ", ".join(NEXT_BUTTON_SELECTORS + PREV_BUTTON_SELECTORS)
+
+    # Resolves the first matching next/prev button in one round-trip.
+    # arguments[0]/[1] are the next/prev selector lists, in priority order.
+    _NAV_PROBE_JS = """
+        function probe(selectors) {
+            for (var i = 0; i < selectors.length; i++) {
+                var el = document.querySelector(selectors[i]);
+                if (el) {
+                    return {
+                        element: el,
+                        selector: selectors[i],
+                        text: (el.innerText || el.textContent || '').trim(),
+                        enabled: !el.disabled,
+                        displayed: el.offsetParent !== null
+                    };
+                }
+            }
+            return null;
+        }
+        return {next: probe(arguments[0]), prev: probe(arguments[1])};
+    """
+
+    # scrollIntoView with behavior 'instant' is synchronous, so the click can follow immediately
+    _SCROLL_CLICK_JS = (
+        "arguments[0].scrollIntoView({behavior: 'instant', block: 'center'});"
+        "arguments[0].click();"
+    )
 
-    def __init__(self, driver):
+    def __init__(self, driver, max_history=1024):
         """
         Initialize NavigationManager.
 
         Args:
             driver: Selenium WebDriver instance
+            max_history: Maximum number of pages kept in history (oldest dropped first)
         """
         self.driver = driver
-        self.page_history: List[Dict[str, Any]] = []
+        self.page_history: Deque[Dict[str, Any]] = deque(maxlen=max_history)
         self.current_position = -1
+        # WebDriverWait instances keyed by timeout
+        self._waits: Dict[float, WebDriverWait] = {}
+
+    def _wait(self, timeout):
+        """
+        Get a WebDriverWait for the given timeout, created on first use.
+
+        Args:
+            timeout: Maximum time to wait
+
+        Returns:
+            WebDriverWait: Wait polling every 0.2s
+        """
+        wait = self._waits.get(timeout)
+        if wait is None:
+            wait = self._waits[timeout] = WebDriverWait(self.driver, timeout, poll_frequency=0.2)
+        return wait
 
     def get_navigation_state(self):
         """
@@ -73,48 +165,42 @@ class NavigationManager:
             'prev_selector_used': None
         }
 
+        probe = self.driver.execute_script(
+            self._NAV_PROBE_JS, self.NEXT_BUTTON_SELECTORS, self.PREV_BUTTON_SELECTORS
+        )
+
         # Check Next button
-        for selector in self.NEXT_BUTTON_SELECTORS:
-            try:
-                next_btn = self.driver.find_element(By.CSS_SELECTOR, selector)
-                nav_state['next_button'] = next_btn
-                nav_state['can_go_next'] = next_btn.is_enabled() and next_btn.is_displayed()
-                nav_state['next_button_text'] = next_btn.text.strip()
-                nav_state['next_selector_used'] = selector
-
-                # Check if this looks like a final page button
-                button_text = nav_state['next_button_text'].lower()
-                final_indicators = ['dokončit', 'dokonč', 'dokon', 'odeslat', 'finish', 'submit', 'complete']
-                nav_state['is_final_page'] = any(indicator in button_text for indicator in final_indicators)
-
-                break
-            except NoSuchElementException:
-                continue
+        next_info = probe.get('next')
+        if next_info:
+            nav_state['next_button'] = next_info['element']
+            nav_state['can_go_next'] = next_info['enabled'] and next_info['displayed']
+            nav_state['next_button_text'] = next_info['text']
+            nav_state['next_selector_used'] = next_info['selector']
+
+            # Check if this looks like a final page button
+            nav_state['is_final_page'] = bool(self._FINAL_BUTTON_RE.search(nav_state['next_button_text']))
 
         # Check Previous button
-        for selector in self.PREV_BUTTON_SELECTORS:
-            try:
-                prev_btn = self.driver.find_element(By.CSS_SELECTOR, selector)
-                nav_state['prev_button'] = prev_btn
-                nav_state['can_go_back'] = prev_btn.is_enabled() and prev_btn.is_displayed()
-                nav_state['prev_button_text'] = prev_btn.text.strip()
-                nav_state['prev_selector_used'] = selector
-                break
-            except NoSuchElementException:
-                continue
+        prev_info = probe.get('prev')
+        if prev_info:
+            nav_state['prev_button'] = prev_info['element']
+            nav_state['can_go_back'] = prev_info['enabled'] and prev_info['displayed']
+            nav_state['prev_button_text'] = prev_info['text']
+            nav_state['prev_selector_used'] = prev_info['selector']
 
         logger.debug(f"Navigation state: next={nav_state['can_go_next']}, "
                     f"back={nav_state['can_go_back']}, final={nav_state['is_final_page']}")
 
         return nav_state
 
-    def navigate_next(self, wait_for_load=True, timeout=10):
+    def navigate_next(self, wait_for_load=True, timeout=10, nav_state=None):
         """
         Navigate to the next page.
 
         Args:
             wait_for_load: Whether to wait for new page to load
             timeout: Maximum time to wait for page load
+            nav_state: State from get_navigation_state for the current page, to skip re-probing
 
         Returns:
             str: New page ID after navigation
@@ -122,7 +208,8 @@ class NavigationManager:
         Raises:
             NavigationError: If navigation fails
         """
-        nav_state = self.get_navigation_state()
+        if nav_state is None:
+            nav_state = self.get_navigation_state()
 
         if not nav_state['can_go_next']:
             raise NavigationError("Cannot navigate next - button not available, disabled, or hidden")
@@ -144,9 +231,7 @@ class NavigationManager:
         try:
             # Click the next button
             next_button = nav_state['next_button']
-            self.driver.execute_script("arguments[0].scrollIntoView(true);", next_button)
-            time.sleep(0.2)  # Brief pause for scroll
-            next_button.click()
+            self.driver.execute_script(self._SCROLL_CLICK_JS, next_button)
 
             logger.debug(f"Clicked next button: '{nav_state['next_button_text']}'")
 
@@ -166,13 +251,14 @@ class NavigationManager:
             logger.error(f"Navigation next failed: {e}")
             raise NavigationError(f"Failed to navigate next: {e}")
 
-    def navigate_previous(self, wait_for_load=True, timeout=10):
+    def navigate_previous(self, wait_for_load=True, timeout=10, nav_state=None):
         """
         Navigate to the previous page.
 
         Args:
             wait_for_load: Whether to wait for page to load
             timeout: Maximum time to wait for page load
+            nav_state: State from get_navigation_state for the current page, to skip re-probing
 
         Returns:
             str: New page ID after navigation
@@ -180,7 +266,8 @@ class NavigationManager:
         Raises:
             NavigationError: If navigation fails
         """
-        nav_state = self.get_navigation_state()
+        if nav_state is None:
+            nav_state = self.get_navigation_state()
 
         if not nav_state['can_go_back']:
             raise NavigationError("Cannot navigate back - button not available, disabled, or hidden")
@@ -191,9 +278,7 @@ class NavigationManager:
         try:
             # Click the previous button
             prev_button = nav_state['prev_button']
-            self.driver.execute_script("arguments[0].scrollIntoView(true);", prev_button)
-            time.sleep(0.2)  # Brief pause for scroll
-            prev_button.click()
+            self.driver.execute_script(self._SCROLL_CLICK_JS, prev_button)
 
             logger.debug(f"Clicked previous button: '{nav_state['prev_button_text']}'")
 
@@ -237,7 +322,16 @@ class NavigationManager:
         Returns:
             list: List of page information dictionaries
         """
-        return self.page_history.copy()
+        return list(self.page_history)
+
+    def iter_page_history(self):
+        """
+        Iterate over page history without copying it.
+
+        Returns:
+            iterator: Page information dictionaries, oldest first
+        """
+        return iter(self.page_history)
 
     def can_navigate_back_in_history(self):
         """
@@ -256,14 +350,15 @@ class NavigationManager:
             dict: Navigation summary
         """
         nav_state = self.get_navigation_state()
+        snapshot = PageIdentifier.get_page_snapshot(self.driver)
 
         return {
-            'current_page': PageIdentifier.get_page_id(self.driver),
+            'current_page': snapshot['page_id'],
             'navigation_state': nav_state,
             'history_length': len(self.page_history),
             'current_position': self.current_position,
             'can_go_back_in_history': self.can_navigate_back_in_history(),
-            'is_final_page': nav_state['is_final_page'] or PageIdentifier.is_final_page(self.driver)
+            'is_final_page': nav_state['is_final_page'] or snapshot['is_final']
         }
 
     def reset_history(self):
@@ -284,18 +379,12 @@ class NavigationManager:
         """
         logger.debug(f"Waiting for navigation buttons (timeout: {timeout}s)")
 
-        wait = WebDriverWait(self.driver, timeout)
+        wait = self._wait(timeout)
 
         # Wait for either next or previous button to be present and enabled
         try:
-            # Create a combined condition for any navigation button
-            all_nav_selectors = self.NEXT_BUTTON_SELECTORS + self.PREV_BUTTON_SELECTORS
-            combined_selector = ", ".join(all_nav_selectors)
-
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, combined_selector)))
-
-            # Additional wait for button to be enabled
-            time.sleep(0.5)
+            # Returns as soon as any navigation button is visible and enabled
+            wait.until(self._any_nav_button_clickable)
 
             nav_state = self.get_navigation_state()
             logger.debug("Navigation buttons ready")
@@ -306,6 +395,21 @@ class NavigationManager:
             logger.warning(f"Navigation buttons not ready after {timeout}s")
             return self.get_navigation_state()
 
+    def _any_nav_button_clickable(self, driver):
+        """
+        Wait condition: any next/previous button is displayed and enabled.
+
+        EC.element_to_be_clickable only checks the first DOM match, which may be
+        a hidden button while another matching one is usable.
+        """
+        try:
+            return any(
+                element.is_displayed() and element.is_enabled()
+                for element in driver.find_elements(By.CSS_SELECTOR, self._COMBINED_NAV_SELECTOR)
+            )
+        except StaleElementReferenceException:
+            return False
+
     def find_navigation_elements(self):
         """
         Find and return all navigation elements on current page.
@@ -313,69 +417,17 @@ class NavigationManager:
         Returns:
             dict: Dictionary of found navigation elements
         """
-        elements = {
-            'next_buttons': [],
-            'prev_buttons': [],
-            'other_nav_elements': []
-        }
-
-        # Find all next buttons
-        for selector in self.NEXT_BUTTON_SELECTORS:
-            try:
-                buttons = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for button in buttons:
-                    elements['next_buttons'].append({
-                        'element': button,
-                        'selector': selector,
-                        'text': button.text.strip(),
-                        'enabled': button.is_enabled(),
-                        'displayed': button.is_displayed()
-                    })
-            except Exception as e:
-                logger.debug(f"Error finding next buttons with '{selector}': {e}")
-
-        # Find all previous buttons
-        for selector in self.PREV_BUTTON_SELECTORS:
-            try:
-                buttons = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for button in buttons:
-                    elements['prev_buttons'].append({
-                        'element': button,
-                        'selector': selector,
-                        'text': button.text.strip(),
-                        'enabled': button.is_enabled(),
-                        'displayed': button.is_displayed()
-                    })
-            except Exception as e:
-                logger.debug(f"Error finding prev buttons with '{selector}': {e}")
-
-        # Find other potential navigation elements
-        other_selectors = [
-            'input[type="submit"]',
-            'button[type="submit"]',
-            '.btn-primary',
-            '.btn-success',
-            '.continue-btn',
-            '.submit-btn'
-        ]
-
-        for selector in other_selectors:
-            try:
-                buttons = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for button in buttons:
-                    # Skip if already found in next/prev buttons
-                    if (any(button == nb['element'] for nb in elements['next_buttons']) or
-                        any(button == pb['element'] for pb in elements['prev_buttons'])):
-                        continue
-
-                    elements['other_nav_elements'].append({
-                        'element': button,
-                        'selector': selector,
-                        'text': button.text.strip(),
-                        'enabled': button.is_enabled(),
-                        'displayed': button.is_displayed()
-                    })
-            except Exception as e:
-                logger.debug(f"Error finding other nav elements with '{selector}': {e}")
-
-        return elements
\ No newline at end of file
+        try:
+            return self.driver.execute_script(
+                self._NAV_WALK_JS,
+                self.NEXT_BUTTON_SELECTORS,
+                self.PREV_BUTTON_SELECTORS,
+                self.OTHER_NAV_SELECTORS
+            )
+        except Exception as e:
+            logger.debug(f"Error finding navigation elements: {e}")
+            return {
+                'next_buttons': [],
+                'prev_buttons': [],
+                'other_nav_elements': []
+            }
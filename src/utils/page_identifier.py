@@ -3,11 +3,12 @@ Page Identifier Utility for Evaluace Filler
 Provides robust page identification for dotazník pages using consistent selectors.
 """
 
+import re
 import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import TimeoutException
 from loguru import logger
 
 
@@ -21,7 +22,7 @@ class PageIdentifier:
     PRIMARY_QUESTION_SELECTOR = ".question-text .ls-label-question"
 
     # Fallback selectors for special pages
-    FALLBACK_SELECTORS = [
+    FALLBACK_SELECTORS = (
         "h1",
         "h2",
         ".page-title",
@@ -29,46 +30,132 @@ class PageIdentifier:
         ".ls-page-header h1",
         ".ls-page-header h2",
         ".main-title"
-    ]
+    )
+
+    # Primary + fallback selectors, in priority order, and as one CSS selector
+    _ALL_SELECTORS = (PRIMARY_QUESTION_SELECTOR, *FALLBACK_SELECTORS)
+    _COMBINED_PAGE_SELECTOR = ", ".join(_ALL_SELECTORS)
+
+    # Text fragments marking a final/completion page
+    FINAL_INDICATORS = (
+        "dokončit", "dokončení", "odeslat", "odesláno", "complete", "completion",
+        "finish", "finished", "submit", "submitted", "thank you", "děkujeme",
+        "úspěšně", "successfully", "hotovo", "done"
+    )
+    _FINAL_RE = re.compile("|".join(map(re.escape, FINAL_INDICATORS)), re.IGNORECASE)
+
+    # Elements that only exist on final pages
+    FINAL_SELECTORS = (
+        ".completion-page",
+        ".thank-you-page",
+        ".final-page",
+        ".ls-completion",
+        "#completion"
+    )
+
+    # Collects page id, identifying selector, final-page markers, title and URL in one round-trip.
+    # arguments[0] = page selectors in priority order, arguments[1] = final selectors
+    _SNAPSHOT_JS = """
+        var pageSelectors = arguments[0], finalSelectors = arguments[1];
+        var snapshot = {
+            text: null, textSelector: null, presentSelector: null, finalSelector: null,
+            title: (document.title || '').trim(), url: location.href
+        };
+        for (var i = 0; i < pageSelectors.length; i++) {
+            var el = document.querySelector(pageSelectors[i]);
+            if (!el) continue;
+            if (snapshot.presentSelector === null) snapshot.presentSelector = pageSelectors[i];
+            var text = (el.innerText || '').trim();
+            if (text) {
+                snapshot.text = text;
+                snapshot.textSelector = pageSelectors[i];
+                break;
+            }
+        }
+        for (var j = 0; j < finalSelectors.length; j++) {
+            if (document.querySelector(finalSelectors[j])) {
+                snapshot.finalSelector = finalSelectors[j];
+                break;
+            }
+        }
+        return snapshot;
+    """
+
+    # Form element counts for validate_page_structure, by result key
+    FORM_SELECTORS = {
+        'inputs': 'input',
+        'buttons': 'button',
+        'selects': 'select',
+        'textareas': 'textarea'
+    }
+
+    # Navigation elements for validate_page_structure, by result key
+    NAV_SELECTORS = {
+        'next_button': '#ls-button-submit, .ls-move-next-btn',
+        'prev_button': '#ls-button-previous, .ls-move-previous-btn'
+    }
+
+    # Gathers everything validate_page_structure checks in one round-trip.
+    # arguments[0] = question selector, arguments[1]/[2] = form/navigation selectors by key
+    _STRUCTURE_JS = """
+        var formSelectors = arguments[1], navSelectors = arguments[2];
+        var question = document.querySelector(arguments[0]);
+        var result = {
+            question: question !== null,
+            questionText: question ? (question.innerText || '').trim() : '',
+            counts: {},
+            nav: {}
+        };
+        Object.keys(formSelectors).forEach(function(key) {
+            result.counts[key] = document.querySelectorAll(formSelectors[key]).length;
+        });
+        Object.keys(navSelectors).forEach(function(key) {
+            result.nav[key] = document.querySelector(navSelectors[key]) !== null;
+        });
+        return result;
+    """
 
     @classmethod
-    def get_page_id(cls, driver):
+    def get_page_id(cls, driver, previous_page_id=None):
         """
         Get unique identifier for current page based on question text or title.
 
         Args:
             driver: Selenium WebDriver instance
+            previous_page_id: Id of the page visited before this one. A document title equal
+                to it is not reused, LimeSurvey repeats the survey name as title on every page
 
         Returns:
             str: Page identifier text or fallback identifier
         """
-        try:
-            # Primary method - main question text
-            question_element = driver.find_element(By.CSS_SELECTOR, cls.PRIMARY_QUESTION_SELECTOR)
-            page_id = question_element.text.strip()
+        # Primary question selector, then fallbacks for special pages - resolved in-page
+        raw = driver.execute_script(cls._SNAPSHOT_JS, cls._ALL_SELECTORS, [])
+        page_id = raw.get('text')
 
-            if page_id:  # Ensure we have non-empty text
+        if page_id:
+            selector = raw.get('textSelector')
+            if selector == cls.PRIMARY_QUESTION_SELECTOR:
                 logger.debug(f"Page identified by question: '{page_id[:50]}...'")
-                return page_id
+            else:
+                logger.debug(f"Page identified by fallback '{selector}': '{page_id[:50]}...'")
+            return page_id
 
-        except NoSuchElementException:
-            logger.debug(f"Primary selector '{cls.PRIMARY_QUESTION_SELECTOR}' not found, trying fallbacks")
+        return cls._page_id_without_text(raw, previous_page_id)
 
-        # Fallback methods for special pages
-        for selector in cls.FALLBACK_SELECTORS:
-            try:
-                element = driver.find_element(By.CSS_SELECTOR, selector)
-                page_id = element.text.strip()
-
-                if page_id:  # Ensure we have non-empty text
-                    logger.debug(f"Page identified by fallback '{selector}': '{page_id[:50]}...'")
-                    return page_id
-
-            except NoSuchElementException:
-                continue
+    @classmethod
+    def _page_id_without_text(cls, raw, previous_page_id=None):
+        """Identify a page with no question/heading text: document title unless it repeats, then URL."""
+        title = raw.get('title')
+        if title and title != previous_page_id:
+            logger.debug(f"Page identified by document title: '{title[:50]}...'")
+            return title
 
         # Final fallback - URL-based identifier
-        current_url = driver.current_url
+        return cls._url_fallback_id(raw['url'])
+
+    @staticmethod
+    def _url_fallback_id(current_url):
+        """Build a page identifier from the URL when no text identifier exists."""
         url_parts = current_url.split('/')
         url_identifier = url_parts[-1] if url_parts[-1] else url_parts[-2]
 
@@ -79,6 +166,49 @@ class PageIdentifier:
         logger.warning(f"No page identifier found, using URL fallback: '{fallback_id}'")
         return fallback_id
 
+    @classmethod
+    def _final_indicator_in(cls, page_id):
+        """Return the first final-page indicator contained in page_id, or None."""
+        match = cls._FINAL_RE.search(page_id)
+        return match.group(0).lower() if match else None
+
+    @classmethod
+    def get_page_snapshot(cls, driver):
+        """
+        Get page id, identifying selector and final-page status in one script call.
+
+        Args:
+            driver: Selenium WebDriver instance
+
+        Returns:
+            dict: page_id, url, title, has_question, question_selector_used, is_final
+        """
+        raw = driver.execute_script(cls._SNAPSHOT_JS, cls._ALL_SELECTORS, cls.FINAL_SELECTORS)
+
+        page_id = raw.get('text')
+        if page_id:
+            logger.debug(f"Page identified by '{raw.get('textSelector')}': '{page_id[:50]}...'")
+        else:
+            page_id = cls._page_id_without_text(raw)
+
+        is_final = False
+        indicator = cls._final_indicator_in(page_id)
+        if indicator:
+            logger.info(f"Final page detected: contains '{indicator}'")
+            is_final = True
+        elif raw.get('finalSelector'):
+            logger.info(f"Final page detected: found element '{raw['finalSelector']}'")
+            is_final = True
+
+        return {
+            'page_id': page_id,
+            'url': raw['url'],
+            'has_question': raw.get('presentSelector') == cls.PRIMARY_QUESTION_SELECTOR,
+            'question_selector_used': raw.get('presentSelector'),
+            'title': raw['title'],
+            'is_final': is_final
+        }
+
     @classmethod
     def wait_for_page_load(cls, driver, timeout=10):
         """
@@ -98,18 +228,14 @@ class PageIdentifier:
 
         wait = WebDriverWait(driver, timeout)
 
-        # Create list of all possible selectors to wait for
-        all_selectors = [cls.PRIMARY_QUESTION_SELECTOR] + cls.FALLBACK_SELECTORS
-
         try:
-            # Wait for any of the selectors to be present
-            for selector in all_selectors:
-                try:
-                    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-                    logger.debug(f"Page loaded, found element: '{selector}'")
-                    return True
-                except TimeoutException:
-                    continue
+            # Wait for any of the selectors to be present - one wait, first match wins
+            try:
+                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, cls._COMBINED_PAGE_SELECTOR)))
+                logger.debug("Page loaded, found question or title element")
+                return True
+            except TimeoutException:
+                pass
 
             # If none of the specific selectors worked, wait for body to be present
             wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
@@ -121,83 +247,46 @@ class PageIdentifier:
             raise
 
     @classmethod
-    def is_final_page(cls, driver):
+    def is_final_page(cls, driver, snapshot=None):
         """
         Check if current page is a final/completion page.
 
         Args:
             driver: Selenium WebDriver instance
+            snapshot: Result of get_page_snapshot for the current page, to skip re-fetching
 
         Returns:
             bool: True if this appears to be a final page
         """
-        page_id = cls.get_page_id(driver).lower()
-
-        final_indicators = [
-            "dokončit", "dokončení", "odeslat", "odesláno", "complete", "completion",
-            "finish", "finished", "submit", "submitted", "thank you", "děkujeme",
-            "úspěšně", "successfully", "hotovo", "done"
-        ]
-
-        for indicator in final_indicators:
-            if indicator in page_id:
-                logger.info(f"Final page detected: contains '{indicator}'")
-                return True
-
-        # Check for specific final page elements
-        final_selectors = [
-            ".completion-page",
-            ".thank-you-page",
-            ".final-page",
-            ".ls-completion",
-            "#completion"
-        ]
-
-        for selector in final_selectors:
-            try:
-                driver.find_element(By.CSS_SELECTOR, selector)
-                logger.info(f"Final page detected: found element '{selector}'")
-                return True
-            except NoSuchElementException:
-                continue
-
-        return False
+        if snapshot is None:
+            snapshot = cls.get_page_snapshot(driver)
+        return snapshot['is_final']
 
     @classmethod
-    def get_page_info(cls, driver):
+    def get_page_info(cls, driver, snapshot=None):
         """
         Get comprehensive information about current page.
 
         Args:
             driver: Selenium WebDriver instance
+            snapshot: Result of get_page_snapshot for the current page, to skip re-fetching
 
         Returns:
             dict: Dictionary with page information
         """
+        if snapshot is None:
+            snapshot = cls.get_page_snapshot(driver)
+
         page_info = {
-            'page_id': cls.get_page_id(driver),
-            'url': driver.current_url,
-            'title': driver.title,
-            'is_final': cls.is_final_page(driver),
-            'has_question': False,
-            'question_selector_used': None,
+            'page_id': snapshot['page_id'],
+            'url': snapshot['url'],
+            'title': snapshot['title'],
+            'is_final': snapshot['is_final'],
+            'has_question': snapshot['has_question'],
+            'question_selector_used': snapshot['question_selector_used'],
             'timestamp': time.time()
         }
 
-        # Check which selector was used for identification
-        try:
-            driver.find_element(By.CSS_SELECTOR, cls.PRIMARY_QUESTION_SELECTOR)
-            page_info['has_question'] = True
-            page_info['question_selector_used'] = cls.PRIMARY_QUESTION_SELECTOR
-        except NoSuchElementException:
-            for selector in cls.FALLBACK_SELECTORS:
-                try:
-                    driver.find_element(By.CSS_SELECTOR, selector)
-                    page_info['question_selector_used'] = selector
-                    break
-                except NoSuchElementException:
-                    continue
-
         return page_info
 
     @classmethod
@@ -218,42 +307,20 @@ class PageIdentifier:
             'elements_found': {}
         }
 
-        # Check for question element
-        try:
-            question_element = driver.find_element(By.CSS_SELECTOR, cls.PRIMARY_QUESTION_SELECTOR)
-            validation['elements_found']['question'] = True
-
-            if not question_element.text.strip():
-                validation['warnings'].append("Question element found but has no text")
+        structure = driver.execute_script(
+            cls._STRUCTURE_JS, cls.PRIMARY_QUESTION_SELECTOR, cls.FORM_SELECTORS, cls.NAV_SELECTORS
+        )
 
-        except NoSuchElementException:
-            validation['elements_found']['question'] = False
+        # Check for question element
+        validation['elements_found']['question'] = structure['question']
+        if not structure['question']:
             validation['warnings'].append("Primary question selector not found")
+        elif not structure['questionText']:
+            validation['warnings'].append("Question element found but has no text")
 
-        # Check for form elements
-        form_selectors = {
-            'inputs': 'input',
-            'buttons': 'button',
-            'selects': 'select',
-            'textareas': 'textarea'
-        }
-
-        for element_type, selector in form_selectors.items():
-            elements = driver.find_elements(By.CSS_SELECTOR, selector)
-            validation['elements_found'][element_type] = len(elements)
-
-        # Check for navigation elements
-        nav_selectors = {
-            'next_button': '#ls-button-submit, .ls-move-next-btn',
-            'prev_button': '#ls-button-previous, .ls-move-previous-btn'
-        }
-
-        for nav_type, selector in nav_selectors.items():
-            try:
-                driver.find_element(By.CSS_SELECTOR, selector)
-                validation['elements_found'][nav_type] = True
-            except NoSuchElementException:
-                validation['elements_found'][nav_type] = False
+        # Check for form and navigation elements
+        validation['elements_found'].update(structure['counts'])
+        validation['elements_found'].update(structure['nav'])
 
         # Determine if this is a valid dotazník page
         has_question = validation['elements_found'].get('question', False)
@@ -4,18 +4,68 @@ Status Indicator Manager
 Python wrapper for managing visual status indicators during automation
 """
 
-from typing import Optional
+import json
+from pathlib import Path
+from typing import Any, Optional, Tuple
 from loguru import logger
+from selenium.common.exceptions import JavascriptException, WebDriverException
 
 
 class StatusIndicatorManager:
     """Manages visual status indicators in the browser during automation"""
 
+    # Returned by CALL_JS when AutomationStatusIndicator is not present in the page
+    MISSING = '__MISSING__'
+
+    # Availability check and method call in one round-trip:
+    # arguments[0] is the method name, the rest are passed through to it
+    CALL_JS = """
+    var indicator = window.AutomationStatusIndicator;
+    if (!indicator || typeof indicator.setStatusWithProgress !== 'function') {
+        return '__MISSING__';
+    }
+    return indicator[arguments[0]].apply(indicator, Array.prototype.slice.call(arguments, 1));
+    """
+
+    # Type and own property names of AutomationStatusIndicator, for failure diagnostics
+    DIAGNOSE_JS = """
+    var indicatorType = typeof window.AutomationStatusIndicator;
+    return {
+        type: indicatorType,
+        methods: indicatorType !== 'undefined' ? Object.getOwnPropertyNames(window.AutomationStatusIndicator) : []
+    };
+    """
+
+    # Appended to status_indicator.js so injection and init share one round-trip
+    INIT_CALL_JS = """
+    if (typeof window.AutomationStatusIndicator === 'undefined' ||
+        typeof window.AutomationStatusIndicator.setStatusWithProgress !== 'function') {
+        return '__MISSING__';
+    }
+    return window.AutomationStatusIndicator.init();
+    """
+
+    # Appended to status_indicator.js when registered for new documents - init needs <head>/<body>
+    NEW_DOCUMENT_INIT_JS = """
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', function() {
+            window.AutomationStatusIndicator.init();
+        });
+    } else {
+        window.AutomationStatusIndicator.init();
+    }
+    """
+
+    # status_indicator.js, shared by all instances once loaded
+    _STATUS_JS: Optional[str] = None
+
     def __init__(self, driver):
         """Initialize with Selenium WebDriver instance"""
         self.driver = driver
         self.js_loader = None
         self.status_js_loaded = False
+        self._cdp_available = True
+        self._new_document_script_id = None  # CDP identifier of the auto-injection script
 
         # Import JavaScript loader
         try:
@@ -25,58 +75,99 @@ class StatusIndicatorManager:
         except ImportError:
             logger.warning("JavaScriptLoader not available, using inline JS")
 
-    def _ensure_status_js_loaded(self) -> bool:
-        """Ensure status indicator JavaScript is loaded in the browser"""
+        self._register_for_new_documents()
+
+    def _evaluate(self, script_body: str, *args) -> Any:
+        """Run a script body (may use 'return' and arguments[i]) via CDP Runtime.evaluate
+
+        Arguments must be JSON-serializable. Falls back to execute_script when CDP is not available.
+        """
+        if self._cdp_available:
+            try:
+                response = self.driver.execute_cdp_cmd('Runtime.evaluate', {
+                    'expression': f"(function() {{\n{script_body}\n}}).apply(null, "
+                                  f"{json.dumps(list(args), ensure_ascii=False)})",
+                    'returnByValue': True
+                })
+            except (WebDriverException, AttributeError) as e:
+                # AttributeError: driver without execute_cdp_cmd (non-Chromium)
+                logger.debug("CDP Runtime.evaluate unavailable, using execute_script: {}", e)
+                self._cdp_available = False
+            else:
+                if 'exceptionDetails' in response:
+                    raise JavascriptException(response['exceptionDetails'].get('text', 'JavaScript error'))
+                return response.get('result', {}).get('value')
+
+        return self.driver.execute_script(script_body, *args)
+
+    def _load_status_js(self) -> Optional[str]:
+        """Return status_indicator.js, reading the file only once"""
+        if StatusIndicatorManager._STATUS_JS is not None:
+            return StatusIndicatorManager._STATUS_JS
+
+        if self.js_loader:
+            status_js = self.js_loader.load_script('status_indicator')
+            logger.debug("Status indicator JS loaded via JavaScriptLoader")
+        else:
+            # Fallback: Load from file directly
+            js_path = Path(__file__).parent.parent / 'js_scripts' / 'status_indicator.js'
+            if not js_path.exists():
+                logger.error(f"Status indicator JS file not found: {js_path}")
+                return None
+            status_js = js_path.read_text(encoding='utf-8')
+            logger.debug("Status indicator JS loaded from file")
+
+        StatusIndicatorManager._STATUS_JS = status_js
+        return status_js
+
+    def _register_for_new_documents(self):
+        """Have Chrome inject and initialize the indicator on every page load"""
+        status_js = self._load_status_js()
+        if status_js is None:
+            return
 
-        # Always check if the JavaScript object is available, regardless of loaded flag
         try:
-            # Check if AutomationStatusIndicator exists and is properly initialized
-            js_check = """
-            return typeof window.AutomationStatusIndicator !== 'undefined' &&
-                   typeof window.AutomationStatusIndicator.setStatusWithProgress === 'function';
-            """
-            is_available = self.driver.execute_script(js_check)
-
-            if is_available and self.status_js_loaded:
-                return True
+            response = self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+                'source': status_js + self.NEW_DOCUMENT_INIT_JS
+            })
+            self._new_document_script_id = response['identifier']
+            logger.debug("Status indicator registered for new documents")
+        except (WebDriverException, AttributeError) as e:
+            # Without CDP the indicator is injected lazily per page by _call_indicator
+            logger.debug("Status indicator auto-injection not available: {}", e)
+
+    def unregister_new_documents(self):
+        """Stop auto-injecting the indicator into new documents - for a WebDriver session that is reused"""
+        if self._new_document_script_id is None:
+            return
+        try:
+            self.driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument', {
+                'identifier': self._new_document_script_id
+            })
+        except (WebDriverException, AttributeError) as e:
+            logger.debug("Could not remove status indicator auto-injection: {}", e)
+        self._new_document_script_id = None
 
-        except Exception as e:
-            logger.debug(f"JavaScript availability check failed: {e}")
-            is_available = False
+    def _ensure_status_js_loaded(self) -> bool:
+        """Ensure status indicator JavaScript is loaded in the browser"""
+
+        # Trust the flag - callers reset it when the page turns out not to have the indicator
+        if self.status_js_loaded:
+            return True
 
-        # If not available or not loaded, load and initialize
+        # Not loaded yet (or invalidated) - inject and initialize in one call
         try:
             logger.debug("Loading/reloading status indicator JavaScript...")
 
-            # Load status indicator JavaScript
-            if self.js_loader:
-                status_js = self.js_loader.load_script('status_indicator')
-                self.driver.execute_script(status_js)
-                logger.debug("Status indicator JS loaded via JavaScriptLoader")
-            else:
-                # Fallback: Load from file directly
-                import os
-                from pathlib import Path
-
-                js_path = Path(__file__).parent.parent / 'js_scripts' / 'status_indicator.js'
-                if js_path.exists():
-                    with open(js_path, 'r', encoding='utf-8') as f:
-                        status_js = f.read()
-                    self.driver.execute_script(status_js)
-                    logger.debug("Status indicator JS loaded from file")
-                else:
-                    logger.error(f"Status indicator JS file not found: {js_path}")
-                    return False
-
-            # Verify the object is now available
-            is_available = self.driver.execute_script(js_check)
-
-            if not is_available:
-                logger.error("AutomationStatusIndicator object not available after loading")
+            status_js = self._load_status_js()
+            if status_js is None:
                 return False
 
-            # Initialize the status indicator
-            result = self.driver.execute_script("return window.AutomationStatusIndicator.init();")
+            result = self.driver.execute_script(status_js + self.INIT_CALL_JS)
+
+            if result == self.MISSING:
+                logger.error("AutomationStatusIndicator object not available after loading")
+                return False
 
             if result:
                 self.status_js_loaded = True
@@ -90,6 +181,33 @@ class StatusIndicatorManager:
             logger.error(f"Failed to load status indicator JS: {e}")
             return False
 
+    def _call_indicator(self, method: str, *args) -> Tuple[bool, Any]:
+        """Call an AutomationStatusIndicator method, loading the script only if it is missing
+
+        Returns:
+            tuple: (indicator available, method result)
+        """
+        try:
+            result = self._evaluate(self.CALL_JS, method, *args)
+            if result != self.MISSING:
+                # Indicator may have been auto-injected on a new document rather than by us
+                self.status_js_loaded = True
+                return True, result
+        except JavascriptException as e:
+            logger.debug("Status indicator call '{}' failed, reloading: {}", method, e)
+
+        # New page, first call or broken indicator - inject the script and retry once
+        self.status_js_loaded = False
+        if not self._ensure_status_js_loaded():
+            return False, None
+
+        result = self._evaluate(self.CALL_JS, method, *args)
+        if result == self.MISSING:
+            logger.error("AutomationStatusIndicator not available after reload")
+            return False, None
+
+        return True, result
+
     def set_status(self, status: str, custom_text: Optional[str] = None) -> bool:
         """Set the status of the visual indicator
 
@@ -100,23 +218,15 @@ class StatusIndicatorManager:
         Returns:
             bool: Success status
         """
-        if not self._ensure_status_js_loaded():
-            return False
-
         try:
-            if custom_text:
-                result = self.driver.execute_script(
-                    "return window.AutomationStatusIndicator.setStatus(arguments[0], arguments[1]);",
-                    status, custom_text
-                )
-            else:
-                result = self.driver.execute_script(
-                    "return window.AutomationStatusIndicator.setStatus(arguments[0]);",
-                    status
-                )
+            available, result = self._call_indicator('setStatus', status, custom_text)
+            if not available:
+                return False
 
             if result:
-                logger.debug(f"Status set to: {status}" + (f" - {custom_text}" if custom_text else ""))
+                logger.opt(lazy=True).debug(
+                    "Status set to: {}", lambda: status + (f" - {custom_text}" if custom_text else "")
+                )
 
             return bool(result)
 
@@ -136,46 +246,26 @@ class StatusIndicatorManager:
         Returns:
             bool: Success status
         """
-        if not self._ensure_status_js_loaded():
-            return False
-
         try:
-            # Double-check that the object is available before calling
-            check_js = """
-            return typeof window.AutomationStatusIndicator !== 'undefined' &&
-                   typeof window.AutomationStatusIndicator.setStatusWithProgress === 'function';
-            """
-
-            if not self.driver.execute_script(check_js):
-                logger.warning("AutomationStatusIndicator not available, attempting to reload...")
-                if not self._ensure_status_js_loaded():
-                    logger.error("Failed to reload status indicator JavaScript")
-                    return False
-
-            result = self.driver.execute_script(
-                "return window.AutomationStatusIndicator.setStatusWithProgress(arguments[0], arguments[1], arguments[2], arguments[3]);",
-                status, current, total, action
-            )
+            available, result = self._call_indicator('setStatusWithProgress', status, current, total, action)
+            if not available:
+                return False
 
             return bool(result)
 
         except Exception as e:
             logger.error(f"Failed to set status with progress: {e}")
-            logger.debug(f"Status: {status}, Current: {current}, Total: {total}, Action: {action}")
+            logger.debug("Status: {}, Current: {}, Total: {}, Action: {}", status, current, total, action)
 
-            # Try to diagnose the issue
+            # Try to diagnose the issue - one round-trip, only paid on this failure path
             try:
-                exists = self.driver.execute_script("return typeof window.AutomationStatusIndicator;")
-                logger.debug(f"AutomationStatusIndicator type: {exists}")
-
-                if exists != 'undefined':
-                    methods = self.driver.execute_script(
-                        "return Object.getOwnPropertyNames(window.AutomationStatusIndicator);"
-                    )
-                    logger.debug(f"Available methods: {methods}")
+                diagnosis = self._evaluate(self.DIAGNOSE_JS)
+                logger.debug("AutomationStatusIndicator type: {}", diagnosis['type'])
+                if diagnosis['type'] != 'undefined':
+                    logger.debug("Available methods: {}", diagnosis['methods'])
 
             except Exception as diag_e:
-                logger.debug(f"Diagnostic check failed: {diag_e}")
+                logger.debug("Diagnostic check failed: {}", diag_e)
 
             return False
 
@@ -189,14 +279,10 @@ class StatusIndicatorManager:
         Returns:
             bool: Success status
         """
-        if not self._ensure_status_js_loaded():
-            return False
-
         try:
-            result = self.driver.execute_script(
-                "return window.AutomationStatusIndicator.setManualRequired(arguments[0], arguments[1]);",
-                reason, suggestion or ""
-            )
+            available, result = self._call_indicator('setManualRequired', reason, suggestion or "")
+            if not available:
+                return False
 
             logger.warning(f"Manual intervention required: {reason}")
             return bool(result)
@@ -207,35 +293,28 @@ class StatusIndicatorManager:
 
     def show(self) -> bool:
         """Show the status indicator"""
-        if not self._ensure_status_js_loaded():
-            return False
-
         try:
-            self.driver.execute_script("window.AutomationStatusIndicator.show();")
-            return True
+            available, _ = self._call_indicator('show')
+            return available
         except Exception as e:
             logger.error(f"Failed to show status indicator: {e}")
             return False
 
     def hide(self) -> bool:
         """Hide the status indicator"""
-        if not self._ensure_status_js_loaded():
-            return False
-
         try:
-            self.driver.execute_script("window.AutomationStatusIndicator.hide();")
-            return True
+            available, _ = self._call_indicator('hide')
+            return available
         except Exception as e:
             logger.error(f"Failed to hide status indicator: {e}")
             return False
 
     def remove(self) -> bool:
         """Remove the status indicator completely"""
-        if not self.status_js_loaded:
-            return True  # Already removed/not loaded
-
         try:
-            self.driver.execute_script("window.AutomationStatusIndicator.remove();")
+            # Guarded so removal when the indicator is absent (never loaded, or gone after a navigation)
+            # is a no-op, not an error - it may also have been auto-injected without status_js_loaded set
+            self._evaluate("if (window.AutomationStatusIndicator) { window.AutomationStatusIndicator.remove(); }")
             self.status_js_loaded = False
             return True
         except Exception as e:
@@ -248,12 +327,9 @@ class StatusIndicatorManager:
         Returns:
             str: Current status or None if not available
         """
-        if not self._ensure_status_js_loaded():
-            return None
-
         try:
-            status = self.driver.execute_script("return window.AutomationStatusIndicator.getStatus();")
-            return status
+            available, status = self._call_indicator('getStatus')
+            return status if available else None
         except Exception as e:
             logger.error(f"Failed to get current status: {e}")
             return None
@@ -264,12 +340,9 @@ class StatusIndicatorManager:
         Returns:
             bool: True if visible, False otherwise
         """
-        if not self._ensure_status_js_loaded():
-            return False
-
         try:
-            visible = self.driver.execute_script("return window.AutomationStatusIndicator.isVisible();")
-            return bool(visible)
+            available, visible = self._call_indicator('isVisible')
+            return available and bool(visible)
         except Exception as e:
             logger.error(f"Failed to check visibility: {e}")
             return False
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test SmartPlaybackSystem keyword matching against the original substring scan
+"""
+
+import os
+import sys
+import json
+import pytest
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.smart_playback_system import SmartPlaybackSystem
+
+SCENARIOS_DIR = Path(__file__).resolve().parent.parent / "scenarios"
+STRATEGY_FILE = SCENARIOS_DIR / "optimized_survey_strategy.json"
+SURVEY_MAPPING_FILE = SCENARIOS_DIR / "survey_mapping_20250925_145010.json"
+
+# Titles not in the recorded mapping: special cases, case variants and an unknown page
+EXTRA_TITLES = [
+    "Dostali jste se na konec dotazníku",
+    "Vítejte v evaluačním dotazníku",
+    "Uveďte, prosím, do jaké míry souhlasíte s následujícími výroky vztahujícími se k Vaší škole v oblasti inkluze.",
+    "NAVŠTĚVUJÍ VAŠI ŠKOLU DĚTI S OMJ?",
+    "Kolik dětí s odlišný mateřský jazyk navštěvuje Vaši školu?",
+    "Počet účastníků ve vzdělávání z Ukrajiny",
+    # Decided by strategy priority, not by the longest keyword
+    "Navštěvují děti s OMJ Vaši školu? Uveďte, prosím, do jaké míry souhlasíte",
+    "Stránka bez známých klíčových slov",
+    "",
+]
+
+
+def scenario_titles():
+    """Recorded page titles from the survey mapping, followed by EXTRA_TITLES."""
+    with open(SURVEY_MAPPING_FILE, 'r', encoding='utf-8') as f:
+        mapping = json.load(f)
+    titles = [page['page_id'] for page in mapping['page_sequence']] + EXTRA_TITLES
+    return list(dict.fromkeys(titles))
+
+
+def enable_random_matrix(strategy_config):
+    """Apply the batch processor's random matrix toggle to a strategy config."""
+    default_strategies = strategy_config['default_strategies']
+    default_strategies['MATRIX_RANDOM_RATING']['enabled'] = True
+    default_strategies['MATRIX_RANDOM_RATING']['priority'] = 10
+    for strategy_name in ['MATRIX_RATING_A6', 'MATRIX_RATING_A5']:
+        default_strategies[strategy_name]['priority'] = 0
+
+
+def baseline_match(strategy_config, page_title):
+    """
+    Original substring scan - returns (special case name, strategy name)
+
+    Strategy name is the best keyword match or the fuzzy fallback, None if neither applies.
+    """
+    for case_name, case_config in strategy_config.get('special_cases', {}).items():
+        for pattern in case_config.get('page_patterns', []):
+            if pattern.lower() in page_title.lower():
+                return case_name, None
+
+    default_strategies = strategy_config.get('default_strategies', {})
+    matched_strategies = []
+
+    for strategy_name, strategy_config_item in default_strategies.items():
+        if not strategy_config_item.get('enabled', True):
+            continue
+
+        keywords = strategy_config_item.get('keywords', [])
+        keyword_matches = [keyword for keyword in keywords if keyword.lower() in page_title.lower()]
+        if keyword_matches:
+            match_score = len(max(keyword_matches, key=len)) + strategy_config_item.get('priority', 0)
+            matched_strategies.append((match_score, strategy_name))
+
+    if matched_strategies:
+        matched_strategies.sort(key=lambda x: x[0], reverse=True)
+        return None, matched_strategies[0][1]
+
+    fuzzy_config = strategy_config.get('fuzzy_matching', {})
+    if fuzzy_config.get('enabled', True):
+        fallback_strategy = fuzzy_config.get('fallback_strategy', 'MATRIX_RATING_A6')
+        if fallback_strategy in default_strategies:
+            return None, fallback_strategy
+
+    return None, None
+
+
+@pytest.fixture(scope="module", params=[
+    ("automaton", False), ("automaton", True), ("linear", False), ("linear", True),
+], ids=["automaton", "automaton-random-matrix", "linear", "linear-random-matrix"])
+def playback(request):
+    """SmartPlaybackSystem on the shipped strategy config, using one keyword matcher."""
+    matcher, random_matrix = request.param
+    system = SmartPlaybackSystem(strategy_file=str(STRATEGY_FILE))
+
+    if random_matrix:
+        enable_random_matrix(system.strategy_config)
+        system.rebuild_strategy_index()
+
+    if matcher == "automaton":
+        if system._keyword_automaton is None:
+            pytest.skip("pyahocorasick not installed")
+    else:
+        # Without the automaton get_page_strategy uses the compiled regex matchers
+        system._keyword_automaton = None
+
+    return system
+
+
+@pytest.mark.parametrize("page_title", scenario_titles())
+def test_matcher_agrees_with_baseline(playback, page_title):
+    """Test that the keyword matcher picks the same special case and strategy as the substring scan."""
+    expected_case, expected_strategy = baseline_match(playback.strategy_config, page_title)
+    title_folded = page_title.casefold()
+
+    if playback._keyword_automaton is not None:
+        special_case, _ = playback._match_keywords_automaton(title_folded)
+    else:
+        special_case, _ = playback._match_keywords_linear(title_folded)
+
+    assert special_case == expected_case
+
+    # Resolve from scratch, not from an earlier test's cached result
+    playback._strategy_cache.clear()
+    strategy = playback.get_page_strategy(page_title)
+
+    if expected_case == 'barrier_free_exception':
+        assert strategy is playback._barrier_free_strategy
+    elif expected_case:
+        assert strategy is playback.strategy_config['special_cases'][expected_case].get('strategy')
+    elif expected_strategy:
+        assert strategy is playback.strategy_config['default_strategies'][expected_strategy]
+    else:
+        assert strategy is None
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -1,341 +1,220 @@
 #!/usr/bin/env python3
 """
-Test utilities: PageIdentifier and NavigationManager
+Test utilities: PageIdentifier, NavigationManager and JavaScriptLoader
 """
 
 import os
 import sys
-import time
+import pytest
+from pathlib import Path
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from loguru import logger
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from utils.page_identifier import PageIdentifier
 from utils.navigation_manager import NavigationManager, NavigationError
+from utils.javascript_loader import JavaScriptLoader
+
+# Test pages, loaded over file:// so their UTF-8 text arrives intact; URIs resolved once at import
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+FIXTURE_URIS = {path.stem: path.as_uri() for path in FIXTURES_DIR.glob("*.html")}
 
 
 def get_test_driver():
     """Create test WebDriver instance."""
     chrome_options = Options()
-    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--disable-extensions")
+    # Needed when running inside containers
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--window-size=1920,1080")
-
-    chromedriver_path = os.path.join(os.path.dirname(__file__), "..", "drivers", "chromedriver")
-    service = Service(chromedriver_path)
-
-    return webdriver.Chrome(service=service, options=chrome_options)
-
-
-def test_page_identifier():
-    """Test PageIdentifier functionality."""
-    logger.info("🧪 Testing PageIdentifier...")
-
-    # Test HTML with dotazník structure
-    test_html = """
-    <!DOCTYPE html>
-    <html>
-    <head><title>Test Dotazník</title></head>
-    <body>
-        <div class="question-text">
-            <div id="ls-question-text-123" class="ls-label-question">
-                Vyplňte, prosím, rok svého narození
-            </div>
-        </div>
-
-        <input type="text" name="birth_year" id="answer123" />
-
-        <button id="ls-button-submit" type="submit" value="movenext" name="move"
-                class="ls-move-btn ls-move-next-btn ls-move-submit-btn btn btn-lg btn-primary">
-            Další
-        </button>
-
-        <button id="ls-button-previous" type="submit" value="moveprev" name="move"
-                class="ls-move-btn ls-move-previous-btn btn btn-lg btn-default">
-            Předcházející
-        </button>
-    </body>
-    </html>
-    """
-
-    driver = get_test_driver()
-    try:
-        driver.get(f"data:text/html,{test_html}")
-
-        # Test page identification
-        page_id = PageIdentifier.get_page_id(driver)
-        logger.info(f"📝 Page ID: '{page_id}'")
+    # Tests only check the DOM
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    # load_test_page waits for the elements it needs, no need to block on the load event
+    chrome_options.page_load_strategy = "eager"
 
-        # Test that we got some reasonable text (handling encoding issues with data URI)
-        assert "rok" in page_id.lower() and "narozen" in page_id.lower(), f"Page ID doesn't contain expected keywords: '{page_id}'"
+    # Selenium Manager resolves a chromedriver matching the installed Chrome and caches it
+    return webdriver.Chrome(options=chrome_options)
 
-        # Test page info
-        page_info = PageIdentifier.get_page_info(driver)
-        logger.info(f"📊 Page info: {page_info}")
 
-        assert page_info['has_question'] == True
-        assert page_info['question_selector_used'] == ".question-text .ls-label-question"
-        assert page_info['is_final'] == False
+def load_test_page(driver, name):
+    """Open tests/fixtures/<name>.html and wait until its question or heading element is present."""
+    driver.get(FIXTURE_URIS[name])
+    PageIdentifier.wait_for_page_load(driver, timeout=2)
 
-        # Test page validation
-        validation = PageIdentifier.validate_page_structure(driver)
-        logger.info(f"✅ Validation: {validation}")
 
-        assert validation['is_valid_dotaznik'] == True
-        assert validation['elements_found']['question'] == True
-        assert validation['elements_found']['next_button'] == True
-        assert validation['elements_found']['prev_button'] == True
+@pytest.fixture(scope="module")
+def driver():
+    """One Chrome instance shared by all tests in this module."""
+    test_driver = get_test_driver()
+    yield test_driver
+    test_driver.quit()
 
-        logger.success("✅ PageIdentifier tests passed")
-        return True
 
-    except Exception as e:
-        logger.error(f"❌ PageIdentifier test failed: {e}")
-        return False
+@pytest.mark.parametrize("page, expected_id, expected_selector, is_final", [
+    # Standard dotazník question
+    ("identifier", "Vyplňte, prosím, rok svého narození", PageIdentifier.PRIMARY_QUESTION_SELECTOR, False),
+    # No question element - fallback selectors
+    ("fallback", "Welcome to the Survey", "h1", False),
+    # Completion page, detected by the "Děkujeme" question text
+    ("final", "Děkujeme za vyplnění dotazníku", PageIdentifier.PRIMARY_QUESTION_SELECTOR, True),
+], ids=["question", "fallback", "final"])
+def test_page_identification(driver, page, expected_id, expected_selector, is_final):
+    """Test page id, page info and final page detection across page types."""
+    load_test_page(driver, page)
 
-    finally:
-        driver.quit()
+    assert PageIdentifier.get_page_id(driver) == expected_id
 
+    # One snapshot answers the page info and final checks
+    snapshot = PageIdentifier.get_page_snapshot(driver)
+    page_info = PageIdentifier.get_page_info(driver, snapshot=snapshot)
 
-def test_navigation_manager():
-    """Test NavigationManager functionality."""
-    logger.info("🧪 Testing NavigationManager...")
-
-    # Test HTML with navigation buttons
-    test_html = """
-    <!DOCTYPE html>
-    <html>
-    <head><title>Navigation Test</title></head>
-    <body>
-        <div class="question-text">
-            <div class="ls-label-question">Test Navigation Question</div>
-        </div>
-
-        <input type="radio" name="answer" value="yes" id="yes"> Yes
-        <input type="radio" name="answer" value="no" id="no"> No
-
-        <button id="ls-button-submit" type="submit" value="movenext" name="move"
-                class="ls-move-btn ls-move-next-btn">
-            Další
-        </button>
-
-        <button id="ls-button-previous" type="submit" value="moveprev" name="move"
-                class="ls-move-btn ls-move-previous-btn">
-            Předcházející
-        </button>
-    </body>
-    </html>
-    """
-
-    driver = get_test_driver()
-    try:
-        driver.get(f"data:text/html,{test_html}")
+    assert page_info['page_id'] == expected_id
+    assert page_info['question_selector_used'] == expected_selector
+    assert page_info['has_question'] == (expected_selector == PageIdentifier.PRIMARY_QUESTION_SELECTOR)
+    assert page_info['is_final'] == is_final
+    assert PageIdentifier.is_final_page(driver, snapshot=snapshot) == is_final
 
-        # Initialize NavigationManager
-        nav_manager = NavigationManager(driver)
 
-        # Test navigation state
-        nav_state = nav_manager.get_navigation_state()
-        logger.info(f"🧭 Navigation state: {nav_state}")
+def test_repeated_title_falls_back_to_url(driver):
+    """Test that two pages without text sharing one title get different ids."""
+    # No question or heading - driver.get already waits for the document
+    driver.get(FIXTURE_URIS["untitled_first"])
+    first_id = PageIdentifier.get_page_id(driver)
 
-        assert nav_state['can_go_next'] == True
-        assert nav_state['can_go_back'] == True
-        # Handle encoding issues with button text - just check that we have some text
-        assert len(nav_state['next_button_text']) > 0, f"Next button has no text: '{nav_state['next_button_text']}'"
-        assert len(nav_state['prev_button_text']) > 0, f"Prev button has no text: '{nav_state['prev_button_text']}'"
+    driver.get(FIXTURE_URIS["untitled_second"])
+    second_id = PageIdentifier.get_page_id(driver, previous_page_id=first_id)
 
-        # Test navigation elements finder
-        nav_elements = nav_manager.find_navigation_elements()
-        logger.info(f"🔍 Found navigation elements: next={len(nav_elements['next_buttons'])}, prev={len(nav_elements['prev_buttons'])}")
+    assert first_id == "Evaluace dotazník"
+    assert second_id.startswith("page_untitled_second.html_")
+    # Without a previous id the lookup is stable for the same page
+    assert PageIdentifier.get_page_id(driver) == PageIdentifier.get_page_id(driver) == first_id
 
-        assert len(nav_elements['next_buttons']) >= 1
-        assert len(nav_elements['prev_buttons']) >= 1
 
-        # Test navigation summary
-        summary = nav_manager.get_navigation_summary()
-        logger.info(f"📋 Navigation summary: {summary}")
-
-        assert summary['current_page'] == "Test Navigation Question"
-        assert summary['navigation_state']['can_go_next'] == True
-
-        logger.success("✅ NavigationManager tests passed")
-        return True
-
-    except Exception as e:
-        logger.error(f"❌ NavigationManager test failed: {e}")
-        return False
-
-    finally:
-        driver.quit()
+def test_page_validation(driver):
+    """Test dotazník structure validation."""
+    load_test_page(driver, "identifier")
 
+    validation = PageIdentifier.validate_page_structure(driver)
 
-def test_fallback_selectors():
-    """Test fallback selectors when main question selector is not present."""
-    logger.info("🧪 Testing fallback selectors...")
+    assert validation['is_valid_dotaznik'] == True
+    assert validation['elements_found']['question'] == True
+    assert validation['elements_found']['next_button'] == True
+    assert validation['elements_found']['prev_button'] == True
 
-    # Test HTML without main question selector
-    test_html = """
-    <!DOCTYPE html>
-    <html>
-    <head><title>Fallback Test</title></head>
-    <body>
-        <h1>Welcome to the Survey</h1>
-        <p>This page doesn't have the standard question structure.</p>
 
-        <button id="start-btn">Start Survey</button>
-    </body>
-    </html>
-    """
-
-    driver = get_test_driver()
-    try:
-        driver.get(f"data:text/html,{test_html}")
-
-        # Test page identification with fallback
-        page_id = PageIdentifier.get_page_id(driver)
-        logger.info(f"📝 Fallback Page ID: '{page_id}'")
+def test_navigation_manager(driver):
+    """Test NavigationManager functionality."""
+    load_test_page(driver, "navigation")
 
-        assert page_id == "Welcome to the Survey"
+    # Initialize NavigationManager
+    nav_manager = NavigationManager(driver)
 
-        # Test page info
-        page_info = PageIdentifier.get_page_info(driver)
-        logger.info(f"📊 Fallback page info: {page_info}")
+    # Test navigation state
+    nav_state = nav_manager.get_navigation_state()
 
-        assert page_info['has_question'] == False
-        assert page_info['question_selector_used'] == "h1"
+    assert nav_state['can_go_next'] == True
+    assert nav_state['can_go_back'] == True
+    assert nav_state['next_button_text'] == "Další"
+    assert nav_state['prev_button_text'] == "Předcházející"
 
-        logger.success("✅ Fallback selector tests passed")
-        return True
+    # Test navigation elements finder
+    nav_elements = nav_manager.find_navigation_elements()
 
-    except Exception as e:
-        logger.error(f"❌ Fallback selector test failed: {e}")
-        return False
+    assert len(nav_elements['next_buttons']) >= 1
+    assert len(nav_elements['prev_buttons']) >= 1
 
-    finally:
-        driver.quit()
+    # Test navigation summary
+    summary = nav_manager.get_navigation_summary()
 
+    assert summary['current_page'] == "Test Navigation Question"
+    assert summary['navigation_state']['can_go_next'] == True
 
-def test_final_page_detection():
-    """Test final page detection."""
-    logger.info("🧪 Testing final page detection...")
 
-    # Test HTML with final page indicators
-    test_html = """
-    <!DOCTYPE html>
-    <html>
-    <head><title>Completion</title></head>
-    <body>
-        <div class="question-text">
-            <div class="ls-label-question">Děkujeme za vyplnění dotazníku</div>
-        </div>
+def test_final_page_navigation_state(driver):
+    """Test navigation state on a final page."""
+    load_test_page(driver, "final")
 
-        <p>Váš dotazník byl úspěšně odeslán.</p>
+    # "Dokončit" next button marks the last page
+    nav_manager = NavigationManager(driver)
+    nav_state = nav_manager.get_navigation_state()
 
-        <button id="ls-button-submit" type="submit">
-            Dokončit
-        </button>
-    </body>
-    </html>
-    """
+    assert nav_state['is_final_page'] == True
 
-    driver = get_test_driver()
-    try:
-        driver.get(f"data:text/html,{test_html}")
 
-        # Test final page detection
-        is_final = PageIdentifier.is_final_page(driver)
-        logger.info(f"🏁 Is final page: {is_final}")
+# Navigation script as SmartPlaybackSystem builds it from the strategy config
+NAVIGATION_JS = (
+    "window.__navigationPending = true;\n"
+    "setTimeout(() => document.querySelector('#ls-button-submit')?.click(), 0);"
+)
 
-        # The page should be detected as final due to "Děkujeme" keyword or "Dokončit" button
-        # If not detected, it might be due to encoding issues, so let's check the page content
-        page_id = PageIdentifier.get_page_id(driver)
-        button_text = driver.find_element(By.ID, "ls-button-submit").text.lower()
 
-        logger.info(f"Page ID for final check: '{page_id}'")
-        logger.info(f"Button text for final check: '{button_text}'")
+def navigation_clicked(driver):
+    """True once the fill+navigate script has run the navigation script on the current document."""
+    return driver.execute_script("return window.__navigationPending === true;")
 
-        # Check if any final indicators are present (handling various encodings)
-        is_final_by_content = ("dokoncit" in button_text or "dokončit" in button_text or
-                             "dokon" in button_text or  # Handle encoding issues
-                             "dekuj" in page_id.lower() or "thank" in page_id.lower() or
-                             "kuje" in page_id.lower())  # Handle encoding of "kujeme"
 
-        assert is_final or is_final_by_content, f"Page not detected as final. Page ID: '{page_id}', Button: '{button_text}'"
+def test_fill_and_navigate(driver):
+    """Test that a successful fill clicks Next in the same injection."""
+    load_test_page(driver, "navigation")
 
-        # Test navigation state for final page
-        nav_manager = NavigationManager(driver)
-        nav_state = nav_manager.get_navigation_state()
-        logger.info(f"🧭 Final page nav state: {nav_state}")
+    response = JavaScriptLoader().execute_script_with_navigation(
+        driver, 'radio_strategy', 'executeRadioStrategy', NAVIGATION_JS, 'Yes'
+    )
 
-        assert nav_state['is_final_page'] == True
+    assert response['result']['success'] == True
+    assert response['navigated'] == True
+    assert navigation_clicked(driver)
 
-        logger.success("✅ Final page detection tests passed")
-        return True
 
-    except Exception as e:
-        logger.error(f"❌ Final page detection test failed: {e}")
-        return False
+def test_fill_failure_skips_navigation(driver):
+    """Test that a failed fill does not click Next."""
+    load_test_page(driver, "navigation")
 
-    finally:
-        driver.quit()
+    response = JavaScriptLoader().execute_script_with_navigation(
+        driver, 'radio_strategy', 'executeRadioStrategy', NAVIGATION_JS, 'Missing answer'
+    )
 
+    assert response['result']['success'] == False
+    assert response['navigated'] == False
+    assert not navigation_clicked(driver)
 
-def main():
-    """Run all utility tests."""
-    logger.info("🚀 Starting utility tests...")
 
-    tests = [
-        ("PageIdentifier", test_page_identifier),
-        ("NavigationManager", test_navigation_manager),
-        ("Fallback Selectors", test_fallback_selectors),
-        ("Final Page Detection", test_final_page_detection)
-    ]
+def test_fill_without_next_button(driver):
+    """Test a successful fill on a page without #ls-button-submit."""
+    load_test_page(driver, "no_navigation")
 
-    results = []
-    for test_name, test_func in tests:
-        logger.info(f"\n{'='*50}")
-        logger.info(f"Running: {test_name}")
-        logger.info(f"{'='*50}")
+    response = JavaScriptLoader().execute_script_with_navigation(
+        driver, 'radio_strategy', 'executeRadioStrategy', NAVIGATION_JS, 'Yes'
+    )
 
-        success = test_func()
-        results.append((test_name, success))
+    assert response['result']['success'] == True
+    assert response['navigated'] == False
+    assert not navigation_clicked(driver)
 
-        if success:
-            logger.success(f"✅ {test_name}: PASSED")
-        else:
-            logger.error(f"❌ {test_name}: FAILED")
 
-    # Summary
-    logger.info(f"\n{'='*50}")
-    logger.info("TEST SUMMARY")
-    logger.info(f"{'='*50}")
+def test_fill_and_navigate_on_unregistered_document(driver):
+    """Test the full-script retry when the document predates new-document registration."""
+    load_test_page(driver, "navigation")
 
-    for test_name, success in results:
-        status = "✅ PASS" if success else "❌ FAIL"
-        logger.info(f"{test_name}: {status}")
+    js_loader = JavaScriptLoader()
+    # Registered after the load, so the current document has no script registry
+    if js_loader.register_for_new_documents(driver, ['radio_strategy']) != ['radio_strategy']:
+        pytest.skip("New-document registration unavailable (JS caching disabled)")
 
-    total_passed = sum(1 for _, success in results if success)
-    total_tests = len(results)
+    try:
+        response = js_loader.execute_script_with_navigation(
+            driver, 'radio_strategy', 'executeRadioStrategy', NAVIGATION_JS, 'Yes'
+        )
+    finally:
+        js_loader.unregister_new_documents(driver)
 
-    if total_passed == total_tests:
-        logger.success(f"\n🎉 All utility tests passed! ({total_passed}/{total_tests})")
-        logger.success("Utilities are ready for use!")
-        return True
-    else:
-        logger.error(f"\n💥 Some utility tests failed! ({total_passed}/{total_tests} passed)")
-        return False
+    assert response['result']['success'] == True
+    assert response['navigated'] == True
+    assert navigation_clicked(driver)
 
 
 if __name__ == "__main__":
-    # Setup logging
-    logger.remove()
-    logger.add(sys.stdout, level="INFO", format="<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | {message}")
-
-    success = main()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    sys.exit(pytest.main([__file__, "-v"]))